@@ -0,0 +1,7 @@
+-- 이동 경로 벡터화 결과를 저장하기 위한 컬럼 추가 (raw/8_vectorize_paths.py)
+ALTER TABLE "user" ADD COLUMN IF NOT EXISTS path_polyline JSONB;
+ALTER TABLE "user" ADD COLUMN IF NOT EXISTS path_booths JSONB;
+
+-- 컬럼에 대한 코멘트 추가
+COMMENT ON COLUMN "user".path_polyline IS '경로 획별 encoded polyline 문자열 배열 (0~1 정규화 좌표, 정밀도 1e-4)';
+COMMENT ON COLUMN "user".path_booths IS '경로가 지나간 부스 ID 배열 (지나간 순서)';
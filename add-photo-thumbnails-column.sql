@@ -0,0 +1,7 @@
+-- 사진 썸네일(WebP/AVIF) URL을 저장하기 위한 컬럼 추가 (raw/9_make_photo_thumbnails.py)
+ALTER TABLE "user" ADD COLUMN IF NOT EXISTS photo_thumbnails JSONB;
+ALTER TABLE "evaluation" ADD COLUMN IF NOT EXISTS photo_thumbnails JSONB;
+
+-- 컬럼에 대한 코멘트 추가
+COMMENT ON COLUMN "user".photo_thumbnails IS 'photo_url 썸네일 URL (예: {"sm_webp": "...", "md_avif": "..."})';
+COMMENT ON COLUMN "evaluation".photo_thumbnails IS 'photo_url 썸네일 URL (예: {"sm_webp": "...", "md_avif": "..."})';
@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+연구 분석용 Supabase 테이블을 Parquet로 내보내는 스크립트
+
+대시보드 CSV 내보내기(public/booth_positions_rows.csv 등)는 GPS 데이터가 수백만 행이 되면
+쓸 수 없으므로, PostgREST를 통해
+- 커서 컬럼(기본키 또는 (updated_at, 기본키)) 기준 keyset 페이지네이션으로 읽고
+- 커서 범위를 여러 구간으로 나눠 제한된 연결 수 안에서 동시에 가져오며
+- 명시적인 스키마로 JSON 컬럼(interests, rec_result 등)을 풀어서
+- 날짜별로 파티션된 Parquet 파일에 페이지 단위로 바로 씁니다.
+
+테이블마다 마지막으로 내보낸 커서 값(high-water mark)을 export_state.json에 저장하므로
+다음 실행에서는 그 이후에 추가/수정된 행만 가져옵니다.
+각 구간은 먼저 {output}/.staging/{run_id}/ 아래에 쓰고, 테이블의 모든 구간이 성공했을 때만
+데이터셋 디렉토리로 옮기므로 실패한 실행의 일부 파일이 남아 중복 행이 생기지 않습니다.
+응답에 스키마에 없는 컬럼(또는 JSON 필드)이 있으면 조용히 버리지 않고 그 테이블을 실패 처리합니다.
+(user / evaluation은 updated_at 기준이므로 같은 행의 새 버전이 추가로 쌓입니다.
+ 분석 시 기본키별로 updated_at이 가장 최신인 행을 사용하세요.)
+
+사용법:
+    export SUPABASE_URL=... SUPABASE_KEY=...
+    python3 export_study_tables.py --output ./export
+    python3 export_study_tables.py --tables gps_locations --ranges 16 --concurrency 8
+
+stat.ipynb에서:
+    import pandas as pd
+    gps = pd.read_parquet('export/gps_locations')
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+try:
+    import aiohttp
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    print("❌ aiohttp / pyarrow 패키지가 설치되지 않았습니다!")
+    print("   설치하려면: pip install aiohttp pyarrow")
+    exit(1)
+
+DEFAULT_PAGE_SIZE = 5000   # PostgREST 한 번 요청에 가져올 행 수 (서버 max-rows 이하로)
+DEFAULT_RANGES = 8         # 테이블당 커서 범위를 나눌 구간 수
+DEFAULT_CONCURRENCY = 4    # 동시에 열 HTTP 연결 수 (DB 부하 제한)
+SETTLE_SECONDS = 60        # 아직 커밋 중일 수 있는 최근 행은 다음 실행으로 미룸
+
+TS = pa.timestamp('us', tz='UTC')
+
+# 테이블별 스키마 -----------------------------------------------------------------
+# cursor: keyset 페이지네이션 컬럼 (첫 컬럼으로 범위를 나누고, 둘째 컬럼은 같은 값 사이의 순서)
+# partition: Parquet 파티션 컬럼 (값의 날짜로 date=YYYY-MM-DD 디렉토리 생성)
+# settle: id 커서 테이블에서 상한을 정할 때 쓰는 삽입 시각 컬럼
+#         (serial id는 동시 삽입 시 커밋 순서가 뒤바뀔 수 있으므로 settle_seconds보다 오래된 행까지만 읽음)
+
+INTERESTS = pa.map_(pa.string(), pa.list_(pa.string()))
+
+TABLES = {
+    'user': {
+        'cursor': ('updated_at', 'user_id'),
+        'partition': 'updated_at',
+        'schema': pa.schema([
+            ('user_id', pa.string()),
+            ('age', pa.int32()),
+            ('gender', pa.string()),
+            ('visit_purpose', pa.string()),
+            ('is_treat', pa.bool_()),
+            ('interests', INTERESTS),
+            ('has_companion', pa.bool_()),
+            ('companion_count', pa.int32()),
+            ('specific_goal', pa.string()),
+            ('has_children', pa.bool_()),
+            ('child_interests', pa.list_(pa.string())),
+            ('has_pets', pa.bool_()),
+            ('pet_types', pa.list_(pa.string())),
+            ('has_allergies', pa.bool_()),
+            ('allergies', pa.string()),
+            ('followup_questions', pa.list_(pa.string())),
+            ('followup_answers', pa.list_(pa.string())),
+            ('consent_test_participation', pa.bool_()),
+            ('consent_privacy_collection', pa.bool_()),
+            ('consent_third_party_sharing', pa.bool_()),
+            ('initial_form_started_at', TS),
+            ('initial_form_submitted_at', TS),
+            ('skipped_at', TS),
+            ('additional_form_submitted_at', TS),
+            ('started_at', TS),
+            ('ended_at', TS),
+            ('recommended_at', TS),
+            ('rec_result', pa.list_(pa.struct([
+                ('id', pa.string()), ('rationale', pa.string()), ('similarity', pa.float64()),
+            ]))),
+            # 평가(BoothDetailPage)와 신고(RecommendationsPage)가 같은 JSON 배열에 기록됨
+            ('rec_eval', pa.list_(pa.struct([
+                ('id', pa.string()), ('booth_rating', pa.int32()), ('rec_rating', pa.int32()),
+                ('is_irrelevant', pa.bool_()), ('is_booth_wrong_info', pa.bool_()),
+                ('reported_at', TS), ('is_deleted', pa.bool_()),
+            ]))),
+            ('recommendation_modal_clicks', pa.map_(pa.string(), pa.int64())),
+            ('evaluation_finished_at', TS),
+            ('survey_finished_at', TS),
+            ('final_rating', pa.int32()),
+            ('final_pros', pa.string()),
+            ('final_cons', pa.string()),
+            ('exit_recommendation_rating', pa.int32()),
+            ('exit_recommendation_rating_7', pa.int32()),
+            ('exit_map_helpfulness_7', pa.int32()),
+            ('exit_exhibition_rating', pa.int32()),
+            ('exit_exhibition_rating_7', pa.int32()),
+            ('exit_ratings_submitted_at', TS),
+            ('photo_url', pa.string()),
+            ('photo_thumbnails', pa.map_(pa.string(), pa.string())),
+            ('path_image_url', pa.string()),
+            ('path_drawing_url', pa.string()),
+            ('path_polyline', pa.list_(pa.string())),
+            ('path_booths', pa.list_(pa.string())),
+            ('created_at', TS),
+            ('updated_at', TS),
+        ]),
+    },
+    'evaluation': {
+        'cursor': ('updated_at', 'id'),
+        'partition': 'updated_at',
+        'schema': pa.schema([
+            ('id', pa.int64()),
+            ('user_id', pa.string()),
+            ('booth_id', pa.string()),
+            ('photo_url', pa.string()),
+            ('photo_thumbnails', pa.map_(pa.string(), pa.string())),
+            ('booth_rating', pa.int32()),
+            ('rec_rating', pa.int32()),
+            ('started_at', TS),
+            ('ended_at', TS),
+            ('is_deleted', pa.bool_()),
+            ('deleted_at', TS),
+            ('is_irrelevant', pa.bool_()),
+            ('is_booth_wrong_info', pa.bool_()),
+            ('is_correct', pa.bool_()),
+            ('created_at', TS),
+            ('updated_at', TS),
+        ]),
+    },
+    'gps_locations': {
+        # append-only 테이블이므로 serial id만으로 증분 처리
+        'cursor': ('id',),
+        'partition': 'created_at',
+        'settle': 'created_at',
+        'schema': pa.schema([
+            ('id', pa.int64()),
+            ('user_id', pa.string()),
+            ('latitude', pa.float64()),
+            ('longitude', pa.float64()),
+            ('accuracy', pa.float64()),
+            ('timestamp', pa.int64()),
+            ('altitude', pa.float64()),
+            ('speed', pa.float64()),
+            ('heading', pa.float64()),
+            ('created_at', TS),
+        ]),
+    },
+    'booth_similarities': {
+        'cursor': ('id',),
+        'partition': None,
+        'settle': 'created_at',
+        'schema': pa.schema([
+            ('id', pa.int64()),
+            ('booth_id_1', pa.string()),
+            ('booth_id_2', pa.string()),
+            ('similarity_score', pa.float64()),
+            ('created_at', TS),
+        ]),
+    },
+}
+
+
+# 값 변환 -------------------------------------------------------------------------
+
+def parse_timestamp(value):
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def decode_json(value):
+    """TEXT 컬럼에 JSON 문자열로 저장된 값 (rec_result, rec_eval, followup_* 등)"""
+    if value is None or not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return value
+
+
+def convert_value(value, arrow_type):
+    if value is None:
+        return None
+    if pa.types.is_timestamp(arrow_type):
+        return parse_timestamp(value)
+    if pa.types.is_map(arrow_type):
+        value = decode_json(value)
+        if not isinstance(value, dict):
+            return None
+        return [(k, convert_value(v, arrow_type.item_type)) for k, v in value.items()]
+    if pa.types.is_list(arrow_type):
+        value = decode_json(value)
+        if not isinstance(value, list):
+            # followup_answers처럼 일반 문자열이 들어 있는 경우 한 원소짜리 리스트로
+            return [value] if isinstance(value, str) else None
+        return [convert_value(v, arrow_type.value_type) for v in value]
+    if pa.types.is_struct(arrow_type):
+        if not isinstance(value, dict):
+            return None
+        return {f.name: convert_value(value.get(f.name), f.type) for f in arrow_type}
+    if pa.types.is_integer(arrow_type):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    if pa.types.is_string(arrow_type) and not isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def unknown_fields(rows, schema):
+    """
+    스키마에 없는 응답 컬럼과 struct JSON 필드 (예: 'rec_eval.reported_at')
+
+    앱이 새 컬럼/필드를 쓰기 시작했는데 스키마를 갱신하지 않으면 연구 데이터가 조용히 빠지므로 검사합니다.
+    """
+    unknown = set()
+    for row in rows:
+        unknown.update(k for k in row if k not in schema.names)
+        for field in schema:
+            struct_type = field.type.value_type if pa.types.is_list(field.type) else field.type
+            if not pa.types.is_struct(struct_type):
+                continue
+            value = decode_json(row.get(field.name))
+            items = value if isinstance(value, list) else [value]
+            names = {f.name for f in struct_type}
+            for item in items:
+                if isinstance(item, dict):
+                    unknown.update(f"{field.name}.{k}" for k in item if k not in names)
+    return unknown
+
+
+def rows_to_table(rows, schema):
+    unknown = unknown_fields(rows, schema)
+    if unknown:
+        raise ValueError(f"스키마에 없는 컬럼이 있습니다 (TABLES에 추가 필요): {sorted(unknown)}")
+    columns = {
+        field.name: [convert_value(row.get(field.name), field.type) for row in rows]
+        for field in schema
+    }
+    return pa.Table.from_pydict(columns, schema=schema)
+
+
+# 커서 범위 -----------------------------------------------------------------------
+
+def cursor_literal(value):
+    """PostgREST 필터 값 (timestamp는 ISO 문자열)"""
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def quoted(value):
+    """and=(...)/or(...) 안에서는 '.', ':', ',' 가 들어간 값을 따옴표로 감싸야 함"""
+    if isinstance(value, int):
+        return str(value)
+    return '"' + cursor_literal(value).replace('"', '\\"') + '"'
+
+
+def state_value(value):
+    """export_state.json에 저장할 값 (id는 숫자 그대로, timestamp는 ISO 문자열)"""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def split_ranges(lo, hi, n):
+    """(lo, hi] 구간을 n개의 경계로 나눕니다. lo가 None이면 hi 이하 전체."""
+    if lo is None or n <= 1 or hi is None or hi <= lo:
+        return [(lo, hi)]
+    if isinstance(hi, datetime):
+        step = (hi - lo) / n
+        bounds = [lo + step * i for i in range(n)] + [hi]
+    else:
+        step = max(1, (hi - lo) // n)
+        bounds = list(range(lo, hi, step))[:n] + [hi]
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)]
+
+
+# PostgREST 클라이언트 -----------------------------------------------------------
+
+class Exporter:
+    def __init__(self, http, args, state):
+        self.http = http
+        self.args = args
+        self.state = state
+        self.rest_url = f"{args.supabase_url.rstrip('/')}/rest/v1"
+        self.run_id = time.strftime('%Y%m%dT%H%M%S') + '-' + uuid.uuid4().hex[:6]
+        self.staging_dir = Path(args.output) / '.staging' / self.run_id
+
+    async def get(self, table, params):
+        for attempt in range(1, 4):
+            try:
+                async with self.http.get(f"{self.rest_url}/{table}", params=params) as resp:
+                    if resp.status == 429 or resp.status >= 500:
+                        raise aiohttp.ClientResponseError(resp.request_info, resp.history, status=resp.status)
+                    resp.raise_for_status()
+                    return await resp.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == 3:
+                    raise
+                await asyncio.sleep(attempt * 2)
+
+    async def cursor_bound(self, table, spec, lower, descending, settled_before=None):
+        """커서 첫 컬럼의 최솟값/최댓값 (lower 이후, settled_before 이전에 삽입된 행 중에서)"""
+        col = spec['cursor'][0]
+        params = {'select': col, 'order': f"{col}.{'desc' if descending else 'asc'}", 'limit': '1'}
+        if lower is not None:
+            params[col] = f"gt.{cursor_literal(lower)}"
+        if settled_before is not None and spec.get('settle'):
+            params[spec['settle']] = f"lte.{cursor_literal(settled_before)}"
+        rows = await self.get(table, params)
+        if not rows:
+            return None
+        value = rows[0][col]
+        return parse_timestamp(value) if isinstance(lower, datetime) or col.endswith('_at') else value
+
+    def page_params(self, spec, cursor, upper):
+        cols = spec['cursor']
+        first = cols[0]
+        filters = [f"{first}.lte.{quoted(upper)}"]
+        if cursor is not None:
+            values = [quoted(v) for v in cursor]
+            if len(cols) == 1 or cursor[1] is None:
+                filters.append(f"{first}.gt.{values[0]}")
+            else:
+                # (ts, pk) > (cursor_ts, cursor_pk) 를 PostgREST 필터로 표현
+                filters.append(
+                    f"or({first}.gt.{values[0]},and({first}.eq.{values[0]},{cols[1]}.gt.{values[1]}))"
+                )
+        return {
+            'select': '*',
+            'and': f"({','.join(filters)})",
+            'order': ','.join(f"{c}.asc" for c in cols),
+            'limit': str(self.args.page_size),
+        }
+
+    async def export_range(self, table, spec, range_idx, start_cursor, upper):
+        """한 커서 구간을 keyset으로 끝까지 읽으며 파티션별 Parquet 파일에 바로 씁니다."""
+        schema = spec['schema']
+        cols = spec['cursor']
+        writers = {}
+        cursor = start_cursor
+        last_cursor = None
+        count = 0
+
+        try:
+            while True:
+                rows = await self.get(table, self.page_params(spec, cursor, upper))
+                if not rows:
+                    break
+
+                table_page = rows_to_table(rows, schema)
+                by_partition = self.partition_rows(spec, table_page)
+                # Parquet 인코딩/쓰기는 스레드로 넘겨 다른 구간의 네트워크 대기와 겹치게 함
+                await asyncio.to_thread(self.write_partitions, table, range_idx, writers, by_partition)
+
+                count += len(rows)
+                last = rows[-1]
+                cursor = tuple(
+                    parse_timestamp(last[c]) if c.endswith('_at') else last[c] for c in cols
+                )
+                last_cursor = cursor
+                if len(rows) < self.args.page_size:
+                    break
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        return count, last_cursor
+
+    def partition_rows(self, spec, table_page):
+        col = spec['partition']
+        if not col:
+            return {None: table_page}
+        dates = [v.date().isoformat() if v else 'unknown' for v in table_page.column(col).to_pylist()]
+        parts = {}
+        for value in sorted(set(dates)):
+            mask = pa.array([d == value for d in dates])
+            parts[value] = table_page.filter(mask)
+        return parts
+
+    def write_partitions(self, table, range_idx, writers, by_partition):
+        for value, part in by_partition.items():
+            if value not in writers:
+                directory = self.staging_dir / table
+                if value is not None:
+                    directory = directory / f"date={value}"
+                directory.mkdir(parents=True, exist_ok=True)
+                path = directory / f"part-{self.run_id}-{range_idx:03d}.parquet"
+                writers[value] = pq.ParquetWriter(path, part.schema, compression='zstd')
+            writers[value].write_table(part)
+
+    def publish(self, table):
+        """staging에 쓴 이번 실행의 파일을 데이터셋 디렉토리로 옮깁니다. (같은 파일시스템이라 rename)"""
+        staged = self.staging_dir / table
+        if not staged.exists():
+            return
+        for path in sorted(staged.rglob('*.parquet')):
+            target = Path(self.args.output) / table / path.relative_to(staged)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(path, target)
+        shutil.rmtree(staged, ignore_errors=True)
+
+    async def export_table(self, table):
+        spec = TABLES[table]
+        first_col = spec['cursor'][0]
+        is_ts = first_col.endswith('_at')
+
+        hwm = self.state.get(table)
+        start_cursor = None
+        if hwm:
+            start_cursor = tuple(parse_timestamp(v) if i == 0 and is_ts else v for i, v in enumerate(hwm))
+
+        # 이번 실행에서 읽을 상한 (실행 중에 들어오거나 아직 커밋 중일 수 있는 행은 다음 실행으로)
+        # id 커서는 settle_seconds보다 먼저 삽입된 행 중 최대 id까지만 읽어서,
+        # 늦게 커밋된 작은 id가 high-water mark 뒤로 밀려 영영 빠지는 일이 없도록 함
+        settled_before = datetime.now(timezone.utc) - timedelta(seconds=self.args.settle_seconds)
+        upper = await self.cursor_bound(
+            table, spec, start_cursor[0] if start_cursor else None, descending=True,
+            settled_before=None if is_ts else settled_before,
+        )
+        if upper is None:
+            print(f"  ⏭️  {table}: 새 행 없음")
+            return 0
+        if is_ts:
+            upper = min(upper, settled_before)
+
+        # high-water mark는 이미 내보낸 값이라 제외되지만, 첫 실행의 lower(테이블 최솟값)는 포함됨
+        if start_cursor:
+            lower = start_cursor[0]
+            no_new_rows = lower >= upper
+        else:
+            lower = await self.cursor_bound(table, spec, None, descending=False)
+            no_new_rows = lower is None or lower > upper
+        if no_new_rows:
+            print(f"  ⏭️  {table}: 새 행 없음")
+            return 0
+
+        ranges = split_ranges(lower, upper, self.args.ranges)
+        tasks = []
+        for idx, (lo, hi) in enumerate(ranges):
+            if idx == 0:
+                # 첫 구간: 저장된 high-water mark부터 (처음 실행이면 최솟값 포함)
+                cursor = start_cursor
+            else:
+                cursor = (lo,) if len(spec['cursor']) == 1 else (lo, None)
+            tasks.append(self.export_range(table, spec, idx, cursor, hi))
+
+        started = time.time()
+        # 한 구간이 실패해도 나머지 구간이 끝날 때까지 기다린 뒤 staging을 정리
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            shutil.rmtree(self.staging_dir / table, ignore_errors=True)
+            raise errors[0]
+        total = sum(count for count, _ in results)
+
+        # 모든 구간이 성공했을 때만 데이터셋으로 옮기고 high-water mark 갱신
+        self.publish(table)
+        cursors = [c for _, c in results if c is not None]
+        if cursors:
+            self.state[table] = [state_value(v) for v in max(cursors)]
+
+        print(f"  ✅ {table}: {total:,}행 ({len(ranges)}개 구간, {time.time() - started:.1f}초)")
+        return total
+
+
+async def run_export(args):
+    state_path = Path(args.output) / 'export_state.json'
+    state = {}
+    if state_path.exists() and not args.full:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+
+    headers = {'apikey': args.supabase_key, 'Authorization': f'Bearer {args.supabase_key}'}
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    timeout = aiohttp.ClientTimeout(total=120)
+
+    print(f"📦 Parquet 내보내기 시작: {', '.join(args.tables)} → {args.output}")
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as http:
+        exporter = Exporter(http, args, state)
+        for table in args.tables:
+            try:
+                await exporter.export_table(table)
+            except Exception as e:
+                print(f"  ❌ {table} 내보내기 실패: {e}")
+            finally:
+                # 테이블 하나가 끝날 때마다 상태 저장 (중간에 실패해도 완료된 테이블은 다시 받지 않음)
+                state_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(state_path, 'w', encoding='utf-8') as f:
+                    json.dump(state, f, ensure_ascii=False, indent=2)
+        shutil.rmtree(exporter.staging_dir, ignore_errors=True)
+
+    print(f"\n💾 high-water mark를 {state_path}에 저장했습니다.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='연구 분석용 테이블 Parquet 내보내기')
+    parser.add_argument('--output', default='export', help='Parquet 저장 디렉토리')
+    parser.add_argument('--tables', nargs='+', default=list(TABLES), choices=list(TABLES))
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument('--ranges', type=int, default=DEFAULT_RANGES, help='테이블당 동시에 읽을 커서 구간 수')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='최대 동시 연결 수')
+    parser.add_argument('--settle-seconds', type=int, default=SETTLE_SECONDS)
+    parser.add_argument('--full', action='store_true', help='high-water mark를 무시하고 전체 다시 내보내기')
+    args = parser.parse_args()
+
+    args.supabase_url = os.getenv('SUPABASE_URL')
+    args.supabase_key = os.getenv('SUPABASE_KEY')
+    if not args.supabase_url or not args.supabase_key:
+        print("❌ SUPABASE_URL과 SUPABASE_KEY 환경 변수가 필요합니다!")
+        return
+
+    asyncio.run(run_export(args))
+
+
+if __name__ == "__main__":
+    main()
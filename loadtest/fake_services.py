@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+부하 테스트용 Gemini / Supabase Storage 대역(stand-in) 서버
+
+실제 API 대신 지연 시간과 오류율을 조절할 수 있는 가짜 엔드포인트를 제공합니다.
+- POST /v1beta/models/{model}:embedContent     → 3072차원 임베딩 (같은 텍스트는 같은 벡터)
+- POST /v1beta/models/{model}:generateContent  → 부스 20개 추천 JSON을 담은 응답
+- POST /storage/v1/object/{bucket}/{path}      → 업로드 수신 (선택적으로 디스크에 저장)
+
+사용법:
+    python3 fake_services.py --port 8090 --embed-ms 150 --llm-ms 2500 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+from pathlib import Path
+
+try:
+    from aiohttp import web
+except ImportError:
+    print("❌ aiohttp 패키지가 설치되지 않았습니다!")
+    print("   설치하려면: pip install aiohttp")
+    exit(1)
+
+EMBEDDING_DIM = 3072  # gemini-embedding-001 차원 (booth_embeddings.embedding과 동일)
+
+BOOTH_JSONL = Path(__file__).parent.parent / 'public' / 'foodweek_selected.jsonl'
+
+# 모든 벡터가 공유하는 기준 방향. 가짜 임베딩끼리도 코사인 유사도가 0.3 이상 나오도록 해서
+# search_similar_booths의 match_threshold를 통과하는 실제와 비슷한 결과 크기를 만듦
+_BASE_RNG = random.Random(0)
+BASE_VECTOR = [_BASE_RNG.gauss(0, 1) for _ in range(EMBEDDING_DIM)]
+
+
+def fake_embedding(text):
+    """텍스트 해시를 시드로 만든 결정적 단위 벡터"""
+    seed = int.from_bytes(hashlib.sha1(text.encode('utf-8')).digest()[:8], 'big')
+    rng = random.Random(seed)
+    vec = [b + 0.8 * rng.gauss(0, 1) for b in BASE_VECTOR]
+    norm = math.sqrt(sum(v * v for v in vec))
+    return [round(v / norm, 6) for v in vec]
+
+
+def load_booth_ids():
+    if not BOOTH_JSONL.exists():
+        return [f"A{1000 + i}" for i in range(400)]
+    with open(BOOTH_JSONL, 'r', encoding='utf-8') as f:
+        return [json.loads(line)['id'] for line in f if line.strip()]
+
+
+class FakeServices:
+    def __init__(self, args):
+        self.args = args
+        self.booth_ids = load_booth_ids()
+        self.storage_dir = Path(args.storage_dir) if args.storage_dir else None
+        self.request_counts = {}
+
+    async def _delay(self, median_ms):
+        """로그정규 분포 지연 (긴 꼬리가 있는 실제 API 응답 시간 흉내)"""
+        if median_ms <= 0:
+            return
+        await asyncio.sleep(median_ms / 1000 * math.exp(random.gauss(0, self.args.sigma)))
+
+    def _maybe_fail(self):
+        if random.random() < self.args.error_rate:
+            raise web.HTTPTooManyRequests(
+                text=json.dumps({'error': {'code': 429, 'message': 'Resource has been exhausted'}}),
+                content_type='application/json',
+            )
+
+    def _count(self, name):
+        self.request_counts[name] = self.request_counts.get(name, 0) + 1
+
+    async def gemini(self, request):
+        # aiohttp 라우트 변수는 ':'를 구분하지 못하므로 "{model}:{action}"을 직접 분리
+        model, _, action = request.match_info['model_action'].partition(':')
+        body = await request.json()
+
+        if action == 'embedContent':
+            self._count('embedContent')
+            await self._delay(self.args.embed_ms)
+            self._maybe_fail()
+            text = ' '.join(p.get('text', '') for p in body.get('content', {}).get('parts', []))
+            return web.json_response({'embedding': {'values': fake_embedding(text)}})
+
+        if action == 'generateContent':
+            self._count('generateContent')
+            await self._delay(self.args.llm_ms)
+            self._maybe_fail()
+            picks = random.sample(self.booth_ids, min(20, len(self.booth_ids)))
+            text = json.dumps(
+                [{'id': booth_id, 'rationale': '부하 테스트용 추천 이유입니다.'} for booth_id in picks],
+                ensure_ascii=False,
+            )
+            return web.json_response({
+                'candidates': [{'content': {'parts': [{'text': text}], 'role': 'model'}}],
+                'modelVersion': model,
+            })
+
+        raise web.HTTPNotFound()
+
+    async def storage_upload(self, request):
+        self._count('storage')
+        bucket = request.match_info['bucket']
+        path = request.match_info['path']
+        size = 0
+        target = None
+        if self.storage_dir:
+            target = self.storage_dir / bucket / path
+            target.parent.mkdir(parents=True, exist_ok=True)
+        # 큰 사진도 메모리에 올리지 않도록 스트리밍으로 수신
+        with open(target, 'wb') if target else open('/dev/null', 'wb') as f:
+            async for chunk in request.content.iter_chunked(64 * 1024):
+                size += len(chunk)
+                f.write(chunk)
+        await self._delay(self.args.storage_ms)
+        self._maybe_fail()
+        return web.json_response({'Key': f'{bucket}/{path}', 'size': size})
+
+    async def stats(self, request):
+        return web.json_response(self.request_counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='부하 테스트용 Gemini/Storage 대역 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--embed-ms', type=float, default=150, help='embedContent 지연 중앙값 (ms)')
+    parser.add_argument('--llm-ms', type=float, default=2500, help='generateContent 지연 중앙값 (ms)')
+    parser.add_argument('--storage-ms', type=float, default=200, help='업로드 지연 중앙값 (ms)')
+    parser.add_argument('--sigma', type=float, default=0.4, help='로그정규 지연 분포의 sigma')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='429 응답 비율 (0~1)')
+    parser.add_argument('--storage-dir', default=None, help='업로드 파일을 저장할 디렉토리 (기본: 버림)')
+    args = parser.parse_args()
+
+    services = FakeServices(args)
+    app = web.Application(client_max_size=64 * 1024 * 1024)
+    app.router.add_post('/v1beta/models/{model_action}', services.gemini)
+    app.router.add_post('/storage/v1/object/{bucket}/{path:.*}', services.storage_upload)
+    app.router.add_put('/storage/v1/object/{bucket}/{path:.*}', services.storage_upload)
+    app.router.add_get('/stats', services.stats)
+
+    print(f"🧪 가짜 Gemini/Storage 서버: http://{args.host}:{args.port}")
+    print(f"   embed {args.embed_ms}ms, llm {args.llm_ms}ms, storage {args.storage_ms}ms, 오류율 {args.error_rate}")
+    web.run_app(app, host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+-- Supabase에 기본으로 있는 역할을 로컬 Postgres에도 만들어 둠
+-- (fix-search-function.sql의 GRANT ... TO anon 이 실패하지 않도록)
+CREATE ROLE anon NOLOGIN;
+CREATE ROLE authenticated NOLOGIN;
+CREATE ROLE authenticator LOGIN PASSWORD 'postgres' NOINHERIT;
+GRANT anon TO authenticator;
+GRANT USAGE ON SCHEMA public TO anon, authenticated;
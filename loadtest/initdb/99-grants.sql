@@ -0,0 +1,5 @@
+-- PostgREST anon 역할이 테스트 테이블에 접근할 수 있도록 권한 부여 (로컬 부하 테스트 전용)
+GRANT ALL ON ALL TABLES IN SCHEMA public TO anon;
+GRANT ALL ON ALL SEQUENCES IN SCHEMA public TO anon;
+GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA public TO anon;
+
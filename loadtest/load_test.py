@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+박람회 참관객 세션을 흉내 내는 asyncio 부하 생성기
+
+참관객 한 명의 흐름 (src/ 의 실제 호출 순서를 따름):
+    1. 폼 작성    user insert → initial_form 타임스탬프 / 폼 데이터 update
+    2. 추가 질문  Gemini generateContent → followup_questions / answers update
+    3. 추천       Gemini embedContent → search_similar_booths RPC → Gemini generateContent → rec_result update
+    4. 지도       GPS 15초 간격 gps_locations insert + 부스 방문마다 evaluation insert, 사진 업로드, 평가 update
+    5. 퇴장       exit rating update
+
+단계(stage)마다 동시 참관객 수를 늘려가며(closed model) 지도 단계를 마친 참관객은 새 참관객으로
+교체합니다. 단계별로 엔드포인트마다 처리량, p50/p95/p99 지연, 오류율을 집계하고
+지연/오류 기준을 처음 넘거나 처리량이 더 이상 늘지 않는 단계를 포화 지점으로 보고합니다.
+
+로컬 구성은 loadtest/README.md 참고 (docker compose로 Postgres+pgvector / PostgREST,
+fake_services.py로 Gemini / Storage 대역).
+
+사용법:
+    python3 load_test.py --seed-booths
+    python3 load_test.py --stages 50 100 200 400 --stage-seconds 120
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from pathlib import Path
+
+try:
+    import aiohttp
+except ImportError:
+    print("❌ aiohttp 패키지가 설치되지 않았습니다!")
+    print("   설치하려면: pip install aiohttp")
+    exit(1)
+
+BOOTH_JSONL = Path(__file__).parent.parent / 'public' / 'foodweek_selected.jsonl'
+
+GPS_INTERVAL_SECONDS = 15  # gpsService.startHybridTracking과 동일
+EMBEDDING_MODEL = 'gemini-embedding-001'
+LLM_MODEL = 'gemini-2.5-flash-lite'
+
+# COEX 주변 좌표 (GPS 더미 데이터 생성용)
+COEX_LAT, COEX_LNG = 37.5116, 127.0594
+
+INTERESTS = {
+    '간편식품': ['밀키트', '즉석식품'],
+    '건강식품': ['비건', '다이어트'],
+    '디저트/음료': ['커피', '베이커리'],
+}
+
+
+def percentile(sorted_values, q):
+    """정렬된 리스트의 q 분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[idx]
+
+
+class Recorder:
+    """단계별 / 엔드포인트별 요청 결과를 모아두는 집계기"""
+
+    def __init__(self):
+        self.stage = None
+        self.samples = {}  # (stage, endpoint) -> [(latency_ms, ok)]
+
+    def record(self, endpoint, latency_ms, ok):
+        self.samples.setdefault((self.stage, endpoint), []).append((latency_ms, ok))
+
+    def summarize(self, stage, duration):
+        rows = {}
+        for (s, endpoint), samples in self.samples.items():
+            if s != stage:
+                continue
+            latencies = sorted(ms for ms, _ in samples)
+            errors = sum(1 for _, ok in samples if not ok)
+            rows[endpoint] = {
+                'count': len(samples),
+                'rps': len(samples) / duration,
+                'error_rate': errors / len(samples),
+                'p50': percentile(latencies, 50),
+                'p95': percentile(latencies, 95),
+                'p99': percentile(latencies, 99),
+            }
+        return rows
+
+
+class VisitorSession:
+    """참관객 한 명의 세션. 실제 앱이 보내는 요청을 같은 순서로 보냅니다."""
+
+    def __init__(self, http, args, recorder, booth_ids, photo_bytes):
+        self.http = http
+        self.args = args
+        self.recorder = recorder
+        self.booth_ids = booth_ids
+        self.photo_bytes = photo_bytes
+        self.user_id = f"load_{uuid.uuid4().hex[:12]}"
+        self.lat = COEX_LAT + random.uniform(-0.001, 0.001)
+        self.lng = COEX_LNG + random.uniform(-0.001, 0.001)
+
+    async def _request(self, endpoint, method, url, **kwargs):
+        started = time.perf_counter()
+        ok = False
+        try:
+            async with self.http.request(method, url, **kwargs) as resp:
+                body = await resp.read()
+                ok = resp.status < 400
+                return json.loads(body) if ok and body else None
+        except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError):
+            return None
+        finally:
+            self.recorder.record(endpoint, (time.perf_counter() - started) * 1000, ok)
+
+    async def _think(self, seconds):
+        """사용자가 화면을 읽고 입력하는 시간"""
+        await asyncio.sleep(random.uniform(0.5, 1.5) * seconds)
+
+    # PostgREST / Storage / Gemini 호출 ------------------------------------------
+
+    def _rest(self, path):
+        return f"{self.args.rest_url}/{path}"
+
+    async def insert(self, endpoint, table, row):
+        return await self._request(
+            endpoint, 'POST', self._rest(table), json=row,
+            headers={'Prefer': 'return=representation'},
+        )
+
+    async def update_user(self, endpoint, values):
+        return await self._request(
+            endpoint, 'PATCH', self._rest(f"user?user_id=eq.{self.user_id}"), json=values,
+        )
+
+    async def gemini(self, endpoint, action, model, payload):
+        url = f"{self.args.gemini_url}/v1beta/models/{model}:{action}"
+        return await self._request(endpoint, 'POST', url, json=payload)
+
+    # 세션 흐름 ------------------------------------------------------------------
+
+    async def run(self, stop_event):
+        now = lambda: time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
+        # 1. 폼 작성
+        await self.insert('user.insert', 'user', {
+            'user_id': self.user_id,
+            'initial_form_started_at': now(),
+            'is_treat': False,
+            'consent_test_participation': True,
+            'consent_privacy_collection': True,
+            'consent_third_party_sharing': True,
+        })
+        await self._think(self.args.think_seconds)
+        await self.update_user('user.update', {
+            'initial_form_submitted_at': now(),
+            'age': random.randint(20, 60),
+            'gender': random.choice(['male', 'female']),
+            'visit_purpose': random.choice(['business', 'personal']),
+            'interests': INTERESTS,
+            'ended_at': now(),
+        })
+
+        # 2. 추가 질문 생성 / 답변
+        await self.gemini('gemini.generateContent', 'generateContent', LLM_MODEL, {
+            'contents': [{'parts': [{'text': '추가 질문을 생성해주세요.'}]}],
+        })
+        await self.update_user('user.update', {'followup_questions': '["q1", "q2", "q3"]'})
+        await self._think(self.args.think_seconds)
+        await self.update_user('user.update', {
+            'followup_answers': '["a1", "a2", "a3"]',
+            'additional_form_submitted_at': now(),
+        })
+
+        # 3. 추천 (임베딩 → 벡터 검색 → LLM 재정렬)
+        embedding = await self.gemini('gemini.embedContent', 'embedContent', EMBEDDING_MODEL, {
+            'content': {'parts': [{'text': f"{self.user_id} {json.dumps(INTERESTS, ensure_ascii=False)}"}]},
+            'taskType': 'SEMANTIC_SIMILARITY',
+        })
+        if embedding:
+            await self._request('rpc.search_similar_booths', 'POST', self._rest('rpc/search_similar_booths'), json={
+                'query_embedding': embedding['embedding']['values'],
+                'match_threshold': 0.3,
+                'match_count': 30,
+            })
+        await self.gemini('gemini.generateContent', 'generateContent', LLM_MODEL, {
+            'contents': [{'parts': [{'text': '후보 부스 중 20개를 추천해주세요.'}]}],
+        })
+        recommended = random.sample(self.booth_ids, min(20, len(self.booth_ids)))
+        await self.update_user('user.update', {
+            'rec_result': json.dumps([{'id': b, 'rationale': '...'} for b in recommended]),
+            'recommended_at': now(),
+            'started_at': now(),
+        })
+
+        # 4. 지도: GPS 주기 전송 + 부스 방문
+        gps_task = asyncio.create_task(self._gps_loop(stop_event))
+        map_deadline = time.monotonic() + self.args.map_seconds
+        try:
+            while time.monotonic() < map_deadline and not stop_event.is_set():
+                await self._think(self.args.booth_interval_seconds)
+                if stop_event.is_set():
+                    break
+                await self._visit_booth(random.choice(recommended), now)
+        finally:
+            gps_task.cancel()
+
+        # 5. 퇴장 별점
+        await self.update_user('user.update', {
+            'exit_recommendation_rating': random.randint(1, 5),
+            'exit_exhibition_rating': random.randint(1, 5),
+            'exit_ratings_submitted_at': now(),
+        })
+
+    async def _gps_loop(self, stop_event):
+        # 참관객마다 전송 시점이 겹치지 않도록 시작 위상을 무작위로
+        await asyncio.sleep(random.uniform(0, GPS_INTERVAL_SECONDS))
+        while not stop_event.is_set():
+            self.lat += random.gauss(0, 0.00002)
+            self.lng += random.gauss(0, 0.00002)
+            await self.insert('gps_locations.insert', 'gps_locations', {
+                'user_id': self.user_id,
+                'latitude': self.lat,
+                'longitude': self.lng,
+                'accuracy': random.uniform(5, 30),
+                'timestamp': int(time.time() * 1000),
+            })
+            await asyncio.sleep(GPS_INTERVAL_SECONDS)
+
+    async def _visit_booth(self, booth_id, now):
+        await self.insert('evaluation.insert', 'evaluation', {
+            'user_id': self.user_id,
+            'booth_id': booth_id,
+            'started_at': now(),
+        })
+        if random.random() < self.args.photo_ratio:
+            file_name = f"user_{self.user_id}_booth_{booth_id}_{int(time.time() * 1000)}.jpg"
+            await self._request(
+                'storage.upload', 'POST',
+                f"{self.args.storage_url}/storage/v1/object/user-photos/user-photos/{file_name}",
+                data=self.photo_bytes, headers={'Content-Type': 'image/jpeg'},
+            )
+        await self._request(
+            'evaluation.update', 'PATCH',
+            self._rest(f"evaluation?user_id=eq.{self.user_id}&booth_id=eq.{booth_id}"),
+            json={
+                'booth_rating': random.randint(1, 5),
+                'rec_rating': random.randint(1, 5),
+                'is_correct': True,
+                'ended_at': now(),
+            },
+        )
+
+
+async def visitor_slot(http, args, recorder, booth_ids, photo_bytes, stop_event):
+    """동시 참관객 한 자리. 세션이 끝나면 새 참관객으로 교체합니다."""
+    while not stop_event.is_set():
+        session = VisitorSession(http, args, recorder, booth_ids, photo_bytes)
+        await session.run(stop_event)
+
+
+def detect_saturation(stage_reports, slo_ms, max_error_rate):
+    """p95 SLO / 오류율 기준을 넘거나 처리량 증가가 멈춘 첫 단계"""
+    prev = None
+    for report in stage_reports:
+        total_rps = sum(r['rps'] for r in report['endpoints'].values())
+        worst_p95 = max((r['p95'] for r in report['endpoints'].values()), default=0)
+        errors = max((r['error_rate'] for r in report['endpoints'].values()), default=0)
+        if worst_p95 > slo_ms:
+            return report['visitors'], f"p95 {worst_p95:.0f}ms > SLO {slo_ms:.0f}ms"
+        if errors > max_error_rate:
+            return report['visitors'], f"오류율 {errors:.1%} > {max_error_rate:.1%}"
+        if prev:
+            expected = prev['rps'] * report['visitors'] / prev['visitors']
+            if total_rps < 0.8 * expected:
+                return report['visitors'], f"처리량 {total_rps:.1f} rps (기대치 {expected:.1f} rps의 80% 미만)"
+        prev = {'rps': total_rps, 'visitors': report['visitors']}
+    return None, None
+
+
+def print_stage(report):
+    print(f"\n👥 동시 참관객 {report['visitors']}명 ({report['duration']:.0f}초)")
+    print(f"{'endpoint':<28} {'count':>7} {'rps':>8} {'err':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    print("-" * 80)
+    for endpoint, r in sorted(report['endpoints'].items()):
+        print(
+            f"{endpoint:<28} {r['count']:>7d} {r['rps']:>8.2f} {r['error_rate']:>6.1%} "
+            f"{r['p50']:>7.0f}ms {r['p95']:>7.0f}ms {r['p99']:>7.0f}ms"
+        )
+
+
+async def run_load_test(args):
+    with open(BOOTH_JSONL, 'r', encoding='utf-8') as f:
+        booth_ids = [json.loads(line)['id'] for line in f if line.strip()]
+    # 실제 폰 사진과 비슷한 크기의 더미 업로드 데이터 (압축되지 않도록 무작위 바이트)
+    photo_bytes = random.randbytes(int(args.photo_kb * 1024))
+
+    recorder = Recorder()
+    stop_event = asyncio.Event()
+    slots = []
+    reports = []
+
+    connector = aiohttp.TCPConnector(limit=args.max_connections)
+    timeout = aiohttp.ClientTimeout(total=args.request_timeout)
+    headers = {'apikey': args.api_key, 'Authorization': f'Bearer {args.api_key}'} if args.api_key else {}
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as http:
+        for visitors in args.stages:
+            recorder.stage = visitors
+            # 이전 단계 참관객은 그대로 두고 부족한 만큼만 추가 (ramp-up은 단계 시간의 앞 10%에 분산)
+            ramp = args.stage_seconds * 0.1
+            for _ in range(visitors - len(slots)):
+                await asyncio.sleep(ramp / max(1, visitors))
+                slots.append(asyncio.create_task(
+                    visitor_slot(http, args, recorder, booth_ids, photo_bytes, stop_event)
+                ))
+            stage_started = time.monotonic()
+            await asyncio.sleep(max(0, args.stage_seconds - ramp))
+            duration = time.monotonic() - stage_started + ramp
+
+            report = {'visitors': visitors, 'duration': duration, 'endpoints': recorder.summarize(visitors, duration)}
+            reports.append(report)
+            print_stage(report)
+
+        stop_event.set()
+        for task in slots:
+            task.cancel()
+        await asyncio.gather(*slots, return_exceptions=True)
+
+    saturated_at, reason = detect_saturation(reports, args.slo_ms, args.max_error_rate)
+    print("\n" + "=" * 80)
+    if saturated_at:
+        print(f"🚨 포화 지점: 동시 참관객 약 {saturated_at}명 ({reason})")
+    else:
+        print(f"✅ 최대 {args.stages[-1]}명까지 SLO(p95 {args.slo_ms:.0f}ms, 오류율 {args.max_error_rate:.1%}) 이내")
+    print("=" * 80)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'stages': reports, 'saturated_at': saturated_at, 'reason': reason}, f, ensure_ascii=False, indent=2)
+        print(f"💾 {args.output}에 저장했습니다.")
+
+
+async def seed_booths(args):
+    """booth_embeddings를 가짜 임베딩으로 채웁니다. (search_similar_booths 부하를 실제 크기로 맞추기 위함)"""
+    with open(BOOTH_JSONL, 'r', encoding='utf-8') as f:
+        booths = [json.loads(line) for line in f if line.strip()]
+
+    print(f"🌱 booth_embeddings에 {len(booths)}개 부스를 시드합니다...")
+    async with aiohttp.ClientSession() as http:
+        rows = []
+        for booth in booths:
+            text = ' '.join(str(booth.get(k) or '') for k in ['company_name_kor', 'company_description', 'products'])
+            url = f"{args.gemini_url}/v1beta/models/{EMBEDDING_MODEL}:embedContent"
+            async with http.post(url, json={'content': {'parts': [{'text': text}]}}) as resp:
+                resp.raise_for_status()
+                embedding = (await resp.json())['embedding']['values']
+            rows.append({
+                'id': booth['id'],
+                'company_name_kor': booth.get('company_name_kor') or '',
+                'category': booth.get('category'),
+                'company_description': booth.get('company_description'),
+                'products': booth.get('products'),
+                'products_description': booth.get('products_description'),
+                'embedding': embedding,
+            })
+
+        # foodweek_selected.jsonl에는 같은 부스번호가 두 번 나오는 경우가 있어 upsert로 저장
+        batch_size = 50
+        for i in range(0, len(rows), batch_size):
+            async with http.post(
+                f"{args.rest_url}/booth_embeddings?on_conflict=id",
+                json=rows[i:i+batch_size],
+                headers={'Prefer': 'resolution=merge-duplicates'},
+            ) as resp:
+                resp.raise_for_status()
+            print(f"  ✅ {min(i + batch_size, len(rows))}/{len(rows)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='참관객 세션 부하 테스트')
+    parser.add_argument('--rest-url', default='http://127.0.0.1:3000', help='PostgREST 주소 (Supabase는 <url>/rest/v1)')
+    parser.add_argument('--gemini-url', default='http://127.0.0.1:8090', help='Gemini 대역 서버 주소')
+    parser.add_argument('--storage-url', default='http://127.0.0.1:8090', help='Storage 대역 서버 주소')
+    parser.add_argument('--api-key', default=None, help='apikey 헤더 (로컬 PostgREST는 불필요)')
+    parser.add_argument('--stages', type=int, nargs='+', default=[25, 50, 100, 200, 400], help='단계별 동시 참관객 수')
+    parser.add_argument('--stage-seconds', type=float, default=120)
+    parser.add_argument('--think-seconds', type=float, default=5, help='화면 사이 평균 대기 시간')
+    parser.add_argument('--map-seconds', type=float, default=600, help='참관객 한 명의 지도 단계 길이')
+    parser.add_argument('--booth-interval-seconds', type=float, default=60, help='부스 방문 평균 간격')
+    parser.add_argument('--photo-ratio', type=float, default=0.5, help='부스 방문 시 사진 업로드 비율')
+    parser.add_argument('--photo-kb', type=float, default=2500, help='업로드 사진 크기 (KB)')
+    parser.add_argument('--max-connections', type=int, default=1000)
+    parser.add_argument('--request-timeout', type=float, default=30)
+    parser.add_argument('--slo-ms', type=float, default=5000, help='엔드포인트 p95 지연 허용치 (LLM 포함)')
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--output', default=None, help='결과 JSON 저장 경로')
+    parser.add_argument('--seed-booths', action='store_true', help='booth_embeddings 시드 후 종료')
+    args = parser.parse_args()
+
+    if args.seed_booths:
+        asyncio.run(seed_booths(args))
+    else:
+        asyncio.run(run_load_test(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import sys
+
+from company_name import preprocess_company_name
+from xlsx_stream import ChunkWriter, iter_directory_chunks, iter_xlsx_chunks
+
+# 입력: 부스 리스트 엑셀 파일 또는 주최측 엑셀이 모여 있는 디렉토리
+# 주최측 마스터파일처럼 제목/섹션 행이 앞에 붙어 있어도 헤더를 자동으로 찾고,
+# 카테고리 컬럼이 없으면 섹션 제목('1. 일반식품 (A,B홀)' → 일반식품)을 카테고리로 사용합니다.
+#
+# 디렉토리를 넣으면 파일 이름 순서로 읽고, 같은 (부스번호, 업체명)은 처음 읽은 행만 남깁니다.
+# (한 부스를 여러 업체가 함께 쓰는 경우는 업체명이 다르므로 모두 남음)
+# (예: raw/에는 마스터파일과 정리본 foodweek_booth_info.xlsx가 함께 있으므로
+#  한 가지 출처만 쓰려면 디렉토리 대신 파일 하나를 지정하세요.)
+source = sys.argv[1] if len(sys.argv) > 1 else 'foodweek_booth_info.xlsx'
+
+# 2_merge.py에서 사용하는 컬럼만 남김
+booth_cols = ['부스번호', '업체명', '특별관', '카테고리']
+
+# 헤더 자동 감지에 사용할 컬럼
+required_cols = ['부스번호', '업체명']
+
+if source.endswith('.xlsx'):
+    chunks = iter_xlsx_chunks(source, required_cols, columns=booth_cols, section_column='카테고리')
+else:
+    chunks = iter_directory_chunks(source, required_cols, columns=booth_cols, section_column='카테고리')
+
+seen = {}
+duplicates = conflicts = 0
+
+with ChunkWriter('foodweek_booth_info.csv', booth_cols, parquet_path='foodweek_booth_info.parquet') as writer:
+    for chunk in chunks:
+        rows = []
+        for record in chunk:
+            booth_id = str(record.get('부스번호') or '').strip()
+            key = (booth_id, preprocess_company_name(record.get('업체명')))
+            if booth_id and key in seen:
+                duplicates += 1
+                if seen[key] != record.get('카테고리'):
+                    conflicts += 1
+                continue
+            if booth_id:
+                seen[key] = record.get('카테고리')
+            rows.append(record)
+        writer.write(rows)
+
+if duplicates:
+    print(f"⚠️  중복 부스 {duplicates}개 행을 건너뛰었습니다. (카테고리가 다른 행 {conflicts}개)")
+print(f"완료: {writer.rows_written}개 부스를 foodweek_booth_info.csv에 저장했습니다.")
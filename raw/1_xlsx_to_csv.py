@@ -1,7 +1,10 @@
-import pandas as pd
+import sys
 
-# foodweek.xlsx 파일을 읽어옵니다.
-df = pd.read_excel('foodweek.xlsx')
+from xlsx_stream import ChunkWriter, collapse_categories, iter_directory_chunks, iter_xlsx_chunks
+
+# 입력: foodweek.xlsx 파일 또는 주최측 엑셀이 모여 있는 디렉토리
+# (pd.read_excel로 워크북 전체를 올리지 않고 행 단위로 스트리밍합니다)
+source = sys.argv[1] if len(sys.argv) > 1 else 'foodweek.xlsx'
 
 # category로 통합하지 않을 컬럼명 리스트
 base_cols = [
@@ -14,24 +17,32 @@ base_cols = [
     'products_description'
 ]
 
-# category로 통합할 컬럼명 리스트 추출
-category_cols = [col for col in df.columns if col not in base_cols]
+# base_cols도 아니고 one-hot 카테고리도 아닌 컬럼 (주최측 원본의 영문 소개/상호간판)
+non_category_cols = {
+    'company_description_eng',
+    'signboard_kor',
+    'signboard_eng',
+    '상호간판',
+}
 
-# 각 row별로 one-hot 인코딩된 category 컬럼을 category명 리스트로 변환
-def extract_categories(row):
-    categories = []
-    for col in category_cols:
-        val = row[col]
-        # 값이 'O' 또는 1 또는 True 등으로 체크된 경우만 카테고리로 인정
-        if (isinstance(val, str) and val.strip().upper() == 'O') or (isinstance(val, (int, float)) and val == 1) or (val is True):
-            categories.append(col)
-    return ','.join(categories)
+# 헤더 자동 감지에 사용할 컬럼 (주최측 원본의 '업체명(국문)'도 company_name_kor로 인식됨)
+required_cols = ['company_name_kor']
 
-df['category'] = df.apply(extract_categories, axis=1)
+if source.endswith('.xlsx'):
+    chunks = iter_xlsx_chunks(source, required_cols, expected_columns=base_cols)
+else:
+    chunks = iter_directory_chunks(source, required_cols, expected_columns=base_cols)
 
 # base_cols + ['category'] 만 남기고 저장
 final_cols = base_cols + ['category']
-df_final = df[final_cols]
 
-# csv로 저장
-df_final.to_csv('foodweek.csv', index=False, encoding='utf-8-sig')
\ No newline at end of file
+with ChunkWriter('foodweek.csv', final_cols, parquet_path='foodweek.parquet') as writer:
+    for chunk in chunks:
+        # 두 줄 헤더는 아랫줄 카테고리명이 컬럼명이 되므로,
+        # base_cols / non_category_cols 이외의 컬럼은 모두 one-hot 인코딩된 category 컬럼으로 간주
+        for record in chunk:
+            category_cols = [col for col in record if col not in base_cols and col not in non_category_cols]
+            collapse_categories(record, category_cols)
+        writer.write(chunk)
+
+print(f"완료: {writer.rows_written}개 레코드를 foodweek.csv에 저장했습니다.")
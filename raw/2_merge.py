@@ -1,28 +1,6 @@
 import pandas as pd
-import re
 
-def preprocess_company_name(name):
-    # Handle NaN values
-    if pd.isna(name):
-        return ''
-    name = str(name)
-    
-    # 1. Remove newlines and carriage returns
-    name = name.replace('\n', '').replace('\r', '')
-    
-    # 2. Remove '(주)', '㈜', '주식회사' from both sides iteratively
-    patterns = [r'^\(주\)', r'^㈜', r'^주식회사', r'\(주\)$', r'㈜$', r'주식회사$']
-    prev_name = None
-    while prev_name != name:
-        prev_name = name
-        for pat in patterns:
-            name = re.sub(pat, '', name)
-        name = name.strip()  # Remove spaces after each iteration
-    
-    # 3. Remove all spaces
-    name = name.replace(' ', '')
-    
-    return name
+from company_name import preprocess_company_name
 
 # Load booth info
 booth_df = pd.read_csv('foodweek_booth_info.csv', encoding='utf-8-sig')
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+주최측 업체 리스트의 두 리비전을 비교하여 변경분(changeset)만 뽑아내는 스크립트
+
+리비전이 올 때마다 병합 → 내보내기 → 임베딩 → 업로드를 전부 다시 돌리지 않도록
+부스번호와 정규화된 업체명을 키로 행을 비교하고 다음과 같이 분류합니다.
+
+- added:   새로 추가된 부스
+- removed: 빠진 부스
+- moved:   같은 업체가 다른 부스번호로 이동
+- changed: 같은 부스/업체의 설명(카테고리, 회사소개, 제품 등)이 변경
+
+사용법:
+    python3 5_diff_revisions.py <이전 리비전> <새 리비전> [changeset.json]
+
+입력은 foodweek_selected.jsonl 형식의 .jsonl, .csv, 또는 주최측 .xlsx 모두 가능합니다.
+부스번호가 없는 리비전(예: 업체 리스트_250925.xlsx)이 섞이면 정규화된 업체명만으로 매칭합니다.
+결과 changeset.json은 6_apply_changeset.py가 읽어서 필요한 작업만 수행합니다.
+"""
+
+import csv
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+from company_name import preprocess_company_name
+
+# 설명 변경 여부를 판단할 컬럼 (임베딩 텍스트에 들어가는 컬럼과 동일)
+TEXT_COLUMNS = ['company_name_kor', 'category', 'company_description', 'products', 'products_description']
+
+# 부스번호 형식 (A1101, B5110, S1102, G01 ...). '-' 같은 자리표시 값은 부스번호로 보지 않음
+BOOTH_ID_PATTERN = re.compile(r'^[A-Z]\d{2,5}$')
+
+# 주최측 원본 헤더를 foodweek_selected.jsonl 컬럼명으로 맞춤
+COLUMN_RENAMES = {
+    '부스번호': 'id',
+    '업체명': 'company_name_kor',
+    '카테고리': 'category',
+}
+
+
+def load_records(path):
+    """jsonl / csv / xlsx 파일을 읽어 부스 레코드 리스트로 반환합니다."""
+    path = Path(path)
+
+    if path.suffix == '.jsonl':
+        with open(path, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()]
+    elif path.suffix == '.csv':
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            records = list(csv.DictReader(f))
+    elif path.suffix == '.xlsx':
+        # 엑셀은 스트리밍으로 읽음 (openpyxl 필요)
+        from xlsx_stream import HeaderNotFoundError, iter_xlsx_chunks
+        try:
+            chunks = list(iter_xlsx_chunks(path, ['부스번호', '업체명'], section_column='카테고리'))
+        except HeaderNotFoundError:
+            # 부스 배정 전 업체 리스트는 부스번호 컬럼이 없음 → 업체명만으로 읽음
+            chunks = list(iter_xlsx_chunks(path, ['company_name_kor']))
+        records = [record for chunk in chunks for record in chunk]
+    else:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {path}")
+
+    normalized = []
+    for record in records:
+        record = {COLUMN_RENAMES.get(k, k): v for k, v in record.items()}
+        booth_id = str(record.get('id') or '').strip().upper()
+        record['id'] = booth_id if BOOTH_ID_PATTERN.match(booth_id) else None
+        # 부스번호도 업체명도 없는 행(빈 행, 자리표시 행)은 비교 대상이 아님
+        if record['id'] is None and not preprocess_company_name(record.get('company_name_kor')):
+            continue
+        normalized.append(record)
+
+    # 부스번호가 있는 리비전에서는 부스 미배정 행을 제외
+    if any(r['id'] for r in normalized):
+        normalized = [r for r in normalized if r['id']]
+
+    return normalized
+
+
+def has_booth_ids(records):
+    return any(r['id'] for r in records)
+
+
+def shared_text_columns(old_records, new_records):
+    """
+    두 리비전에 모두 있는 설명 컬럼만 비교 대상으로 삼습니다.
+    (한쪽에만 category가 없는 경우 등 모든 행이 변경으로 잡히지 않도록)
+    """
+    def present(records):
+        return {col for r in records for col, val in r.items() if col in TEXT_COLUMNS}
+    both = present(old_records) & present(new_records)
+    return [col for col in TEXT_COLUMNS if col in both]
+
+
+def text_fingerprint(record, columns=TEXT_COLUMNS):
+    """설명 컬럼들의 해시. 공백 차이는 무시합니다."""
+    parts = []
+    for col in columns:
+        val = record.get(col)
+        parts.append(' '.join(str(val).split()) if val is not None else '')
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def changed_columns(old, new, columns=TEXT_COLUMNS):
+    """값이 달라진 설명 컬럼 목록"""
+    def norm(val):
+        return ' '.join(str(val).split()) if val is not None else ''
+    return [col for col in columns if norm(old.get(col)) != norm(new.get(col))]
+
+
+def diff_revisions(old_records, new_records):
+    """
+    두 리비전을 비교하여 changeset dict를 반환합니다.
+
+    1차: (부스번호, 정규화된 업체명)이 같은 행끼리 매칭 → 설명 비교
+    2차: 남은 행 중 정규화된 업체명이 같은 행끼리 매칭 → 부스 이동
+    나머지: added / removed
+
+    한쪽 리비전에 부스번호가 없으면 (정규화된 업체명, 같은 이름 중 순번)으로만 매칭하고
+    부스 이동은 판단하지 않습니다.
+    """
+    columns = shared_text_columns(old_records, new_records)
+    by_id = has_booth_ids(old_records) and has_booth_ids(new_records)
+
+    def keyed(records):
+        result = {}
+        seen = {}
+        for r in records:
+            name = preprocess_company_name(r.get('company_name_kor'))
+            if by_id:
+                result[(r['id'], name)] = r
+            else:
+                # 여러 부스를 쓰는 업체는 이름이 겹치므로 등장 순서로 구분
+                seen[name] = seen.get(name, 0) + 1
+                result[(name, seen[name])] = r
+        return result
+
+    old_by_key = keyed(old_records)
+    new_by_key = keyed(new_records)
+
+    changed = []
+    unchanged = 0
+
+    # 1차 매칭: 같은 부스, 같은 업체
+    for k in old_by_key.keys() & new_by_key.keys():
+        old, new = old_by_key[k], new_by_key[k]
+        if text_fingerprint(old, columns) == text_fingerprint(new, columns):
+            unchanged += 1
+        else:
+            changed.append({
+                'id': new['id'] or old['id'],
+                'company_name_kor': new.get('company_name_kor'),
+                'columns': changed_columns(old, new, columns),
+            })
+
+    old_rest = {k: r for k, r in old_by_key.items() if k not in new_by_key}
+    new_rest = {k: r for k, r in new_by_key.items() if k not in old_by_key}
+
+    # 2차 매칭: 업체명이 같고 부스번호만 다른 경우 → 이동
+    # (여러 부스를 쓰는 업체는 이름이 겹치므로 남은 부스끼리 순서대로 짝지음)
+    old_by_name = {}
+    if by_id:
+        for k, r in sorted(old_rest.items()):
+            if k[1]:
+                old_by_name.setdefault(k[1], []).append(k)
+
+    moved = []
+    for k, new in sorted(new_rest.items()):
+        candidates = old_by_name.get(k[1])
+        if not candidates:
+            continue
+        old_key = candidates.pop(0)
+        old = old_rest.pop(old_key)
+        del new_rest[k]
+        moved.append({
+            'company_name_kor': new.get('company_name_kor'),
+            'from': old['id'],
+            'to': new['id'],
+            'columns': changed_columns(old, new, columns),
+        })
+
+    added = [r for _, r in sorted(new_rest.items())]
+    removed = [r['id'] or r.get('company_name_kor') for _, r in sorted(old_rest.items())]
+
+    # 부스번호만 바뀌고 설명이 같으면 기존 임베딩을 새 부스번호로 옮겨 재사용
+    rekey = [{'from': m['from'], 'to': m['to']} for m in moved if not m['columns']]
+
+    # 하위 작업 목록 (부스번호가 없는 리비전의 행은 임베딩/좌표 작업 대상이 될 수 없으므로 제외)
+    removed_ids = {r['id'] for r in old_rest.values() if r['id']}
+    changed_ids = {c['id'] for c in changed if c['id']}
+    added_ids = {r['id'] for r in added if r['id']}
+    actions = {
+        # booth_embeddings에서 지울 부스 (삭제 + 설명 변경 + 설명까지 바뀐 이동의 이전 부스)
+        'delete_embeddings': sorted(
+            removed_ids
+            | changed_ids
+            | {m['from'] for m in moved if m['columns']}
+        ),
+        # 임베딩 id만 바꿔서 재사용할 부스
+        'rekey_embeddings': rekey,
+        # 새로 임베딩이 필요한 부스 (create-gemini-embeddings.ts는 누락된 부스만 처리함)
+        'embed': sorted(
+            added_ids
+            | changed_ids
+            | {m['to'] for m in moved if m['columns']}
+        ),
+        # booth_positions에 좌표를 upsert할 부스
+        'upsert_positions': sorted(added_ids | {m['to'] for m in moved}),
+    }
+
+    return {
+        'summary': {
+            'old_total': len(old_records),
+            'new_total': len(new_records),
+            'matched_by': 'booth_id' if by_id else 'company_name',
+            'compared_columns': columns,
+            'unchanged': unchanged,
+            'added': len(added),
+            'removed': len(removed),
+            'moved': len(moved),
+            'changed': len(changed),
+        },
+        'added': added,
+        'removed': removed,
+        'moved': moved,
+        'changed': sorted(changed, key=lambda c: (c['id'] or '', c['company_name_kor'] or '')),
+        'actions': actions,
+    }
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("사용법: python3 5_diff_revisions.py <이전 리비전> <새 리비전> [changeset.json]")
+        sys.exit(1)
+
+    old_path, new_path = sys.argv[1], sys.argv[2]
+    output_path = sys.argv[3] if len(sys.argv) > 3 else 'changeset.json'
+
+    print(f"📄 이전 리비전: {old_path}")
+    print(f"📄 새 리비전:   {new_path}")
+
+    changeset = diff_revisions(load_records(old_path), load_records(new_path))
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(changeset, f, ensure_ascii=False, indent=2)
+
+    summary = changeset['summary']
+    if summary['matched_by'] == 'company_name':
+        print("\n⚠️  한쪽 리비전에 부스번호가 없어 업체명만으로 매칭했습니다. (부스 이동은 판단하지 않음)")
+    print(f"  비교한 설명 컬럼: {', '.join(summary['compared_columns'])}")
+    print("\n" + "=" * 60)
+    print("📊 변경 요약")
+    print("=" * 60)
+    print(f"  변경 없음:   {summary['unchanged']}개")
+    print(f"  추가:        {summary['added']}개")
+    print(f"  삭제:        {summary['removed']}개")
+    print(f"  부스 이동:   {summary['moved']}개")
+    print(f"  설명 변경:   {summary['changed']}개")
+    print(f"\n  임베딩 생성 필요: {len(changeset['actions']['embed'])}개")
+    print(f"  좌표 upsert 필요: {len(changeset['actions']['upsert_positions'])}개")
+    print(f"\n💾 {output_path}에 저장했습니다.")
+
+
+if __name__ == "__main__":
+    main()
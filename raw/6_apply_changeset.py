@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+5_diff_revisions.py가 만든 changeset.json을 Supabase에 반영하는 스크립트
+
+전체를 다시 업로드하지 않고 바뀐 부스에 대해서만 작업합니다.
+- 삭제/설명 변경된 부스의 booth_embeddings, booth_similarities 행 삭제
+- 설명은 그대로이고 부스번호만 바뀐 경우 임베딩의 id만 변경 (재임베딩 없음)
+- 추가/이동된 부스의 booth_positions 좌표만 upsert
+
+이후 scripts/create-gemini-embeddings.ts를 실행하면 누락된(=changeset의 embed) 부스만 임베딩합니다.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+try:
+    from supabase import create_client, Client
+    SUPABASE_AVAILABLE = True
+except ImportError:
+    SUPABASE_AVAILABLE = False
+    print("❌ supabase 패키지가 설치되지 않았습니다!")
+    print("   설치하려면: pip install supabase")
+    exit(1)
+
+
+def apply_changeset(supabase, changeset, booth_positions):
+    """changeset의 actions를 순서대로 반영합니다."""
+    actions = changeset['actions']
+    batch_size = 50
+
+    # 1. 임베딩/유사도 삭제
+    delete_ids = actions['delete_embeddings']
+    for i in range(0, len(delete_ids), batch_size):
+        batch = delete_ids[i:i+batch_size]
+        supabase.table('booth_embeddings').delete().in_('id', batch).execute()
+        supabase.table('booth_similarities').delete().in_('booth_id_1', batch).execute()
+        supabase.table('booth_similarities').delete().in_('booth_id_2', batch).execute()
+    print(f"  🗑️  임베딩 삭제: {len(delete_ids)}개")
+
+    # 2. 부스번호만 바뀐 임베딩은 id만 변경해서 재사용
+    # (부스끼리 번호를 맞바꾼 경우 PK 충돌이 나지 않도록 임시 id를 거쳐서 변경)
+    rekey = actions['rekey_embeddings']
+    for phase in ('tmp', 'final'):
+        for item in rekey:
+            src = item['from'] if phase == 'tmp' else f"~{item['to']}"
+            dst = f"~{item['to']}" if phase == 'tmp' else item['to']
+            supabase.table('booth_embeddings').update({'id': dst}).eq('id', src).execute()
+            supabase.table('booth_similarities').update({'booth_id_1': dst}).eq('booth_id_1', src).execute()
+            supabase.table('booth_similarities').update({'booth_id_2': dst}).eq('booth_id_2', src).execute()
+    print(f"  🔁 임베딩 id 변경: {len(rekey)}개")
+
+    # 3. 추가/이동된 부스 좌표만 upsert
+    positions = [booth_positions[b] for b in actions['upsert_positions'] if b in booth_positions]
+    missing = [b for b in actions['upsert_positions'] if b not in booth_positions]
+    for i in range(0, len(positions), batch_size):
+        batch = positions[i:i+batch_size]
+        supabase.table('booth_positions').upsert(batch, on_conflict='booth_id').execute()
+    print(f"  📍 좌표 upsert: {len(positions)}개")
+
+    if missing:
+        print(f"  ⚠️  좌표가 없는 부스 {len(missing)}개 (관리자 모드에서 수동 입력 필요): {', '.join(missing)}")
+
+
+def main():
+    changeset_path = Path(sys.argv[1] if len(sys.argv) > 1 else 'changeset.json')
+    positions_path = Path(__file__).parent / "extracted_booths_final.json"
+
+    if not changeset_path.exists():
+        print(f"❌ changeset 파일을 찾을 수 없습니다: {changeset_path}")
+        print("   먼저 5_diff_revisions.py를 실행하세요.")
+        return
+
+    with open(changeset_path, 'r', encoding='utf-8') as f:
+        changeset = json.load(f)
+
+    booth_positions = {}
+    if positions_path.exists():
+        with open(positions_path, 'r', encoding='utf-8') as f:
+            booth_positions = {b['booth_id']: b for b in json.load(f)}
+
+    print(f"📄 changeset 로드: {changeset['summary']}")
+
+    # Supabase 설정
+    supabase_url = os.getenv('SUPABASE_URL')
+    supabase_key = os.getenv('SUPABASE_KEY')
+
+    if not supabase_url or not supabase_key:
+        print("❌ SUPABASE_URL과 SUPABASE_KEY 환경 변수가 필요합니다!")
+        return
+
+    supabase: Client = create_client(supabase_url, supabase_key)
+
+    try:
+        apply_changeset(supabase, changeset, booth_positions)
+        print("\n✅ changeset 반영 완료!")
+        if changeset['actions']['embed']:
+            print(f"💡 이제 scripts/create-gemini-embeddings.ts를 실행하면 {len(changeset['actions']['embed'])}개 부스만 임베딩합니다.")
+    except Exception as e:
+        print(f"\n❌ 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
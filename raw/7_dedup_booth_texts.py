@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+부스 텍스트의 중복/유사 중복을 MinHash + LSH로 찾아내는 스크립트
+
+foodweek_selected.jsonl에는
+- products_description이 company_description을 그대로 반복하거나 이어 붙인 레코드
+- 여러 부스를 운영하는 업체가 같은 문구를 쓴 레코드
+가 많습니다. 임베딩/LLM 입력을 줄이기 위해
+
+1. 레코드 내부: 다른 필드에 이미 포함된 필드 내용을 제거 (필드 단위 중복)
+2. 레코드 간:   MinHash 서명을 LSH 밴드로 버킷팅해 후보 쌍만 비교 (O(n^2) 비교 없음)
+                → Jaccard 유사도가 임계값 이상이면 같은 그룹으로 묶음
+
+결과:
+- ../public/booth_text_dedup.jsonl: {id, canonical_id, text, source_hash} (임베딩 입력용 중복 제거 텍스트)
+- duplicate_groups.json:           {대표 부스 id: [같은 그룹 부스 id, ...]}
+
+create-gemini-embeddings.ts는 booth_text_dedup.jsonl이 있으면 text를 임베딩 입력으로 쓰고,
+같은 canonical_id를 가진 부스들은 임베딩 하나를 공유합니다.
+source_hash가 현재 foodweek_selected.jsonl의 필드와 맞지 않는 행(이 스크립트를 다시 돌리지 않고
+설명이 바뀐 부스)은 무시하고 combineBoothText로 만든 텍스트를 씁니다.
+"""
+
+import hashlib
+import json
+import re
+import sys
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+# 필드 순서는 create-gemini-embeddings.ts의 combineBoothText와 동일
+TEXT_FIELDS = ['company_name_kor', 'category', 'company_description', 'products', 'products_description']
+
+# 레코드 간 비교에는 업체명/카테고리를 빼고 설명 위주로 비교
+DESCRIPTION_FIELDS = ['company_description', 'products', 'products_description']
+
+SHINGLE_SIZE = 5          # 문자 단위 shingle 길이 (한국어는 단어보다 문자 n-gram이 안정적)
+NUM_PERM = 128            # MinHash 서명 길이
+NUM_BANDS = 32            # LSH 밴드 수 (밴드당 4행 → 대략 Jaccard 0.4~0.5 부근부터 후보로 잡힘)
+RECORD_THRESHOLD = 0.8    # 레코드 중복 판정 Jaccard 임계값
+FIELD_CONTAINMENT = 0.9   # 필드가 다른 필드에 포함됐다고 볼 containment 임계값
+MIN_FIELD_CHARS = 20      # 이보다 짧은 필드는 필드 단위 중복 판정에서 제외
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def normalize_text(text):
+    """공백을 하나로 합침 (대소문자는 임베딩 입력에 그대로 남기므로 유지)"""
+    if text is None:
+        return ''
+    return re.sub(r'\s+', ' ', str(text)).strip()
+
+
+def source_hash(record):
+    """
+    임베딩 입력이 된 원본 필드의 해시
+
+    create-gemini-embeddings.ts의 sourceHash와 같은 방식(필드를 '\\x1f'로 이어 붙인 sha256)이어야 합니다.
+    """
+    joined = '\x1f'.join('' if record.get(f) is None else str(record.get(f)) for f in TEXT_FIELDS)
+    return hashlib.sha256(joined.encode('utf-8')).hexdigest()
+
+
+def shingles(text, k=SHINGLE_SIZE):
+    """문자 k-gram shingle을 32bit 해시 집합으로 반환 (비교용이므로 소문자로 변환)"""
+    text = normalize_text(text).lower().replace(' ', '')
+    if not text:
+        return set()
+    if len(text) <= k:
+        return {zlib.crc32(text.encode('utf-8'))}
+    return {zlib.crc32(text[i:i+k].encode('utf-8')) for i in range(len(text) - k + 1)}
+
+
+def containment(a, b):
+    """a 집합이 b에 얼마나 포함되는지 (|a∩b| / |a|)"""
+    if not a:
+        return 1.0
+    return len(a & b) / len(a)
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """(a*x + b) mod p 형태의 해시 함수 NUM_PERM개로 MinHash 서명을 계산"""
+
+    def __init__(self, num_perm=NUM_PERM, seed=42):
+        rng = np.random.RandomState(seed)
+        # a, b < 2^32 이고 x < 2^32 이므로 a*x는 uint64 범위를 넘지 않음
+        self.a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, shingle_set):
+        if not shingle_set:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+        x = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set))
+        # (shingle 수 x NUM_PERM) 행렬을 한 번에 계산한 뒤 열마다 최솟값
+        hashed = (np.outer(x, self.a) % MERSENNE_PRIME + self.b) % MERSENNE_PRIME
+        return (hashed & MAX_HASH).min(axis=0)
+
+
+def lsh_candidate_pairs(signatures, num_bands=NUM_BANDS):
+    """서명을 밴드로 나눠 같은 버킷에 들어온 레코드 쌍만 후보로 반환"""
+    rows_per_band = signatures.shape[1] // num_bands
+    candidates = set()
+    for band in range(num_bands):
+        buckets = {}
+        band_slice = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+        for idx, row in enumerate(band_slice):
+            buckets.setdefault(row.tobytes(), []).append(idx)
+        for members in buckets.values():
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    candidates.add((members[i], members[j]))
+    return candidates
+
+
+def dedup_fields(record):
+    """
+    레코드 내부에서 다른 필드에 이미 포함된 설명 내용을 제거한 텍스트 파트 리스트
+
+    예) products_description = company_description + 추가 문장
+        → company_description은 그대로 두고 products_description에서는 추가 문장만 남김
+
+    중복이 없는 필드는 원문을 그대로 두므로, 중복이 없는 레코드의 ' '.join(parts)는
+    create-gemini-embeddings.ts의 combineBoothText 결과와 같습니다.
+    """
+    parts = []
+    descriptions = []
+    for field in TEXT_FIELDS:
+        raw = record.get(field)
+        if raw is None or not str(raw).strip():
+            continue
+        raw = str(raw)
+        if field not in DESCRIPTION_FIELDS:
+            parts.append(raw)
+            continue
+
+        text = normalize_text(raw)
+        original = text
+
+        # 앞선 설명 필드를 그대로 반복/확장한 경우 그 부분을 잘라냄
+        # (제품명처럼 짧은 필드가 설명에 언급된 것은 중복으로 보지 않음)
+        for prev in descriptions:
+            if len(prev) >= MIN_FIELD_CHARS and prev in text:
+                text = text.replace(prev, ' ').strip()
+        if not text:
+            continue
+
+        # 문구가 조금 다른 반복(띄어쓰기, 문장부호 차이 등)은 shingle containment로 판정
+        text_shingles = shingles(text)
+        if len(text) >= MIN_FIELD_CHARS and any(
+            containment(text_shingles, shingles(prev)) >= FIELD_CONTAINMENT for prev in descriptions
+        ):
+            continue
+
+        descriptions.append(text)
+        parts.append(raw if text == original else text)
+    return parts
+
+
+def union_find_groups(n, pairs):
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in pairs:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            # 먼저 나온 레코드를 대표로 사용
+            parent[max(ri, rj)] = min(ri, rj)
+
+    return [find(i) for i in range(n)]
+
+
+def main():
+    input_path = Path(sys.argv[1] if len(sys.argv) > 1 else '../public/foodweek_selected.jsonl')
+    output_path = input_path.parent / 'booth_text_dedup.jsonl'
+    groups_path = Path('duplicate_groups.json')
+
+    with open(input_path, 'r', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+
+    print(f"📄 {len(records)}개의 부스 데이터를 로드했습니다.")
+
+    # 1. 필드 단위 중복 제거
+    texts = []
+    original_chars = 0
+    for record in records:
+        original_chars += sum(len(normalize_text(record.get(f))) for f in TEXT_FIELDS)
+        texts.append(' '.join(dedup_fields(record)))
+
+    # 2. 레코드 단위: MinHash 서명 → LSH 후보 쌍 → 실제 Jaccard 확인
+    hasher = MinHasher()
+    desc_shingles = [
+        shingles(' '.join(normalize_text(r.get(f)) for f in DESCRIPTION_FIELDS))
+        for r in records
+    ]
+    signatures = np.vstack([hasher.signature(s) for s in desc_shingles])
+    candidates = lsh_candidate_pairs(signatures)
+
+    duplicate_pairs = [
+        (i, j) for i, j in candidates
+        if desc_shingles[i] and jaccard(desc_shingles[i], desc_shingles[j]) >= RECORD_THRESHOLD
+    ]
+    roots = union_find_groups(len(records), duplicate_pairs)
+
+    print(f"🔍 LSH 후보 쌍: {len(candidates)}개 (전체 쌍 {len(records) * (len(records) - 1) // 2}개)")
+    print(f"🔗 중복으로 확인된 쌍: {len(duplicate_pairs)}개")
+
+    groups = {}
+    for idx, root in enumerate(roots):
+        members = groups.setdefault(records[root]['id'], [])
+        if records[idx]['id'] not in members:
+            members.append(records[idx]['id'])
+    groups = {k: v for k, v in groups.items() if len(v) > 1}
+
+    # 결과 저장
+    dedup_chars = 0
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for idx, record in enumerate(records):
+            canonical = records[roots[idx]]
+            if roots[idx] == idx:
+                dedup_chars += len(texts[idx])
+            row = {
+                'id': record['id'],
+                'canonical_id': canonical['id'],
+                'text': texts[idx],
+                'source_hash': source_hash(record),
+            }
+            json.dump(row, f, ensure_ascii=False)
+            f.write('\n')
+
+    with open(groups_path, 'w', encoding='utf-8') as f:
+        json.dump(groups, f, ensure_ascii=False, indent=2)
+
+    saved = (1 - dedup_chars / original_chars) * 100 if original_chars else 0
+    print("\n" + "=" * 60)
+    print("✅ 중복 제거 완료!")
+    print("=" * 60)
+    print(f"  중복 그룹: {len(groups)}개 ({sum(len(v) for v in groups.values())}개 부스)")
+    print(f"  임베딩 필요 부스: {len(records)}개 → {len(set(roots))}개")
+    print(f"  임베딩 입력 글자 수: {original_chars:,} → {dedup_chars:,} ({saved:.1f}% 감소)")
+    print(f"\n💾 {output_path}, {groups_path}에 저장했습니다.")
+
+
+if __name__ == "__main__":
+    main()
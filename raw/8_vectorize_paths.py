@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+사용자가 그린 이동 경로 이미지(path_drawing_url)를 폴리라인으로 벡터화하고
+경로가 지나간 부스 목록을 뽑아내는 배치 스크립트
+
+경로 이미지는 투명 배경에 24px 두께의 빨간 선만 있는 지도 원본 크기 PNG입니다.
+(PATH_DRAWING_FEATURE.md 참고) 수 MB짜리 이미지를 사람이 직접 보는 대신
+1. 알파 채널로 선 마스크를 만들고 축소
+2. 스켈레톤화(1px 중심선) → 픽셀 그래프를 따라가며 획(stroke) 단위 폴리라인 추출
+3. Douglas-Peucker로 단순화 후 0~1 정규화 좌표로 변환 (booth_positions와 같은 좌표계)
+4. 부스 좌표와의 거리로 지나간 부스를 경로 순서대로 정렬
+5. 폴리라인은 encoded polyline 문자열로 저장 (사용자당 수백 바이트)
+
+이미지 디코딩/벡터화는 프로세스 풀에서 병렬로 처리합니다.
+
+사용법:
+    # 로컬 디렉토리의 path_drawing_user_{user_id}_{timestamp}.png 파일들
+    python3 8_vectorize_paths.py --input-dir ./path-images
+
+    # Supabase user 테이블의 path_drawing_url을 내려받아 처리하고 결과를 다시 저장
+    python3 8_vectorize_paths.py --from-supabase --upload
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from PIL import Image
+    from skimage.morphology import skeletonize
+except ImportError:
+    print("❌ Pillow / scikit-image 패키지가 설치되지 않았습니다!")
+    print("   설치하려면: pip install pillow scikit-image")
+    exit(1)
+
+# Supabase는 선택적으로 import (없어도 로컬 디렉토리 모드는 동작)
+try:
+    from supabase import create_client, Client
+    SUPABASE_AVAILABLE = True
+except ImportError:
+    SUPABASE_AVAILABLE = False
+
+BOOTH_POSITIONS_PATH = Path(__file__).parent / "extracted_booths_final.json"
+
+WORK_WIDTH = 1024         # 스켈레톤화 전에 축소할 가로 크기 (원본 4963px, 선 24px → 약 5px)
+ALPHA_THRESHOLD = 64      # 선으로 볼 최소 알파 값
+SIMPLIFY_TOLERANCE = 1.5  # Douglas-Peucker 허용 오차 (축소 이미지 픽셀 단위)
+MIN_STROKE_PIXELS = 8     # 이보다 짧은 획은 잡음으로 보고 버림
+BOOTH_RADIUS = 0.012      # 부스를 지나갔다고 볼 경로와의 최대 거리 (정규화 좌표)
+POLYLINE_PRECISION = 1e4  # encoded polyline 정밀도 (0~1 좌표를 소수점 4자리까지)
+
+FILENAME_PATTERN = re.compile(r'path_drawing_user_(.+)_(\d+)\.png$')
+
+# PostgREST는 한 번에 max-rows(기본 1000)행까지만 돌려주므로 이 크기로 나눠서 조회
+PAGE_SIZE = 1000
+
+
+# 이미지 → 폴리라인 ---------------------------------------------------------------
+
+def load_stroke_mask(image_bytes):
+    """경로 이미지에서 선 영역 마스크를 만들고 WORK_WIDTH로 축소합니다."""
+    image = Image.open(io.BytesIO(image_bytes))
+    original_size = image.size
+
+    if image.mode in ('RGBA', 'LA') or 'transparency' in image.info:
+        # 투명 배경 경로 이미지: 알파 채널이 곧 선
+        mask = image.convert('RGBA').getchannel('A')
+    else:
+        # 합성 이미지가 들어온 경우: 경로 색(rgb(255, 82, 82))에 가까운 픽셀만 선으로 봄
+        rgb = np.asarray(image.convert('RGB'), dtype=np.int16)
+        red = (rgb[..., 0] > 180) & (rgb[..., 0] - rgb[..., 1] > 60) & (rgb[..., 0] - rgb[..., 2] > 60)
+        mask = Image.fromarray((red * 255).astype(np.uint8))
+
+    scale = min(1.0, WORK_WIDTH / original_size[0])
+    work_size = (max(1, round(original_size[0] * scale)), max(1, round(original_size[1] * scale)))
+    mask = mask.resize(work_size, Image.BILINEAR)
+    return np.asarray(mask) >= ALPHA_THRESHOLD
+
+
+NEIGHBORS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+def trace_skeleton(skeleton):
+    """
+    1px 스켈레톤을 픽셀 그래프로 보고 끝점/분기점 사이를 따라가며 폴리라인 목록을 만듭니다.
+
+    Returns:
+        [(N, 2) array of (row, col)] 리스트
+    """
+    pixels = set(zip(*np.nonzero(skeleton)))
+
+    def neighbors(p):
+        return [(p[0] + dr, p[1] + dc) for dr, dc in NEIGHBORS if (p[0] + dr, p[1] + dc) in pixels]
+
+    degree = {p: len(neighbors(p)) for p in pixels}
+    nodes = {p for p, d in degree.items() if d != 2}
+    visited_edges = set()
+    paths = []
+
+    def walk(start, nxt):
+        path = [start, nxt]
+        visited_edges.add(frozenset((start, nxt)))
+        prev, cur = start, nxt
+        while cur not in nodes:
+            candidates = [n for n in neighbors(cur) if n != prev and frozenset((cur, n)) not in visited_edges]
+            if not candidates:
+                break
+            prev, cur = cur, candidates[0]
+            visited_edges.add(frozenset((prev, cur)))
+            path.append(cur)
+        return path
+
+    # 끝점/분기점에서 출발하는 가지들
+    for node in sorted(nodes):
+        for n in neighbors(node):
+            if frozenset((node, n)) not in visited_edges:
+                paths.append(walk(node, n))
+
+    # 끝점이 없는 닫힌 고리 (원형으로 그린 경로)
+    for p in sorted(pixels):
+        for n in neighbors(p):
+            if frozenset((p, n)) not in visited_edges:
+                nodes.add(p)
+                paths.append(walk(p, n))
+                nodes.discard(p)
+
+    return [np.array(path, dtype=float) for path in paths if len(path) >= MIN_STROKE_PIXELS]
+
+
+def simplify(points, tolerance=SIMPLIFY_TOLERANCE):
+    """Douglas-Peucker 단순화 (반복 구현, 긴 경로에서도 재귀 깊이 문제 없음)"""
+    if len(points) < 3:
+        return points
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        a, b = points[start], points[end]
+        segment = b - a
+        length = np.hypot(*segment)
+        inner = points[start + 1:end]
+        if length == 0:
+            dist = np.hypot(*(inner - a).T)
+        else:
+            dist = np.abs(segment[0] * (inner[:, 1] - a[1]) - segment[1] * (inner[:, 0] - a[0])) / length
+        idx = int(np.argmax(dist))
+        if dist[idx] > tolerance:
+            mid = start + 1 + idx
+            keep[mid] = True
+            stack.append((start, mid))
+            stack.append((mid, end))
+    return points[keep]
+
+
+def encode_polyline(points):
+    """Google encoded polyline 알고리즘으로 (x, y) 목록을 문자열로 인코딩합니다."""
+    result = []
+    prev_x = prev_y = 0
+    for x, y in points:
+        ix, iy = int(round(x * POLYLINE_PRECISION)), int(round(y * POLYLINE_PRECISION))
+        for value in (iy - prev_y, ix - prev_x):
+            value = ~(value << 1) if value < 0 else value << 1
+            while value >= 0x20:
+                result.append(chr((0x20 | (value & 0x1f)) + 63))
+                value >>= 5
+            result.append(chr(value + 63))
+        prev_x, prev_y = ix, iy
+    return ''.join(result)
+
+
+def booths_on_path(polylines, booth_ids, booth_xy, radius=BOOTH_RADIUS):
+    """
+    경로에서 radius 이내에 있는 부스를 경로를 따라 처음 지나간 순서대로 반환합니다.
+    (이미지에는 그린 방향 정보가 없으므로 순서는 획을 따라가는 방향 기준)
+
+    Args:
+        polylines: 정규화 좌표 (N, 2) 배열 리스트 (x, y)
+        booth_xy: (B, 2) 부스 좌표 배열
+    """
+    best = {}
+    offset = 0.0  # 앞선 획까지의 누적 길이 (획 순서를 유지하기 위함)
+    for line in polylines:
+        if len(line) < 2:
+            continue
+        a, b = line[:-1], line[1:]                      # (S, 2) 선분 시작/끝
+        seg = b - a
+        seg_len = np.hypot(seg[:, 0], seg[:, 1])
+        cum_len = np.concatenate([[0.0], np.cumsum(seg_len)[:-1]])
+
+        # (B, S) 모든 부스 x 모든 선분의 최근접 거리를 한 번에 계산
+        ap = booth_xy[:, None, :] - a[None, :, :]
+        denom = np.where(seg_len > 0, seg_len ** 2, 1.0)
+        t = np.clip((ap * seg[None, :, :]).sum(axis=2) / denom, 0.0, 1.0)
+        closest = a[None, :, :] + t[..., None] * seg[None, :, :]
+        dist = np.hypot(*(booth_xy[:, None, :] - closest).transpose(2, 0, 1))
+
+        nearest_seg = dist.argmin(axis=1)
+        nearest_dist = dist[np.arange(len(booth_xy)), nearest_seg]
+        for booth_idx in np.nonzero(nearest_dist <= radius)[0]:
+            s = nearest_seg[booth_idx]
+            position = offset + cum_len[s] + t[booth_idx, s] * seg_len[s]
+            if booth_idx not in best or position < best[booth_idx]:
+                best[booth_idx] = position
+        offset += seg_len.sum()
+
+    return [booth_ids[i] for i, _ in sorted(best.items(), key=lambda item: item[1])]
+
+
+def vectorize_path(user_id, image_bytes, booth_ids, booth_xy):
+    """이미지 하나를 처리합니다. (프로세스 풀 워커에서 실행)"""
+    mask = load_stroke_mask(image_bytes)
+    height, width = mask.shape
+    skeleton = skeletonize(mask)
+
+    polylines = []
+    for path in trace_skeleton(skeleton):
+        simplified = simplify(path)
+        # (row, col) 픽셀 → (x, y) 0~1 정규화 좌표
+        polylines.append(np.column_stack([simplified[:, 1] / width, simplified[:, 0] / height]))
+
+    encoded = [encode_polyline(line) for line in polylines]
+    length = float(sum(np.hypot(*np.diff(line, axis=0).T).sum() for line in polylines))
+
+    return {
+        'user_id': user_id,
+        'polylines': encoded,
+        'num_points': int(sum(len(line) for line in polylines)),
+        'path_length': round(length, 4),
+        'booths_passed': booths_on_path(polylines, booth_ids, booth_xy) if len(booth_xy) else [],
+        'image_bytes': len(image_bytes),
+        'encoded_bytes': sum(len(e) for e in encoded),
+    }
+
+
+def _worker(task):
+    user_id, source, booth_ids, booth_xy = task
+    if isinstance(source, Path):
+        image_bytes = source.read_bytes()
+    else:
+        with urllib.request.urlopen(source, timeout=60) as resp:
+            image_bytes = resp.read()
+    return vectorize_path(user_id, image_bytes, booth_ids, booth_xy)
+
+
+# 입력 / 출력 ---------------------------------------------------------------------
+
+def load_booth_positions():
+    if not BOOTH_POSITIONS_PATH.exists():
+        print(f"⚠️  부스 좌표 파일이 없습니다: {BOOTH_POSITIONS_PATH} (지나간 부스 추출 생략)")
+        return [], np.zeros((0, 2))
+    with open(BOOTH_POSITIONS_PATH, 'r', encoding='utf-8') as f:
+        booths = json.load(f)
+    return [b['booth_id'] for b in booths], np.array([[b['x'], b['y']] for b in booths], dtype=float)
+
+
+def collect_local_sources(input_dir):
+    """path_drawing_user_{user_id}_{timestamp}.png 중 사용자별 최신 파일만 사용"""
+    latest = {}
+    for path in Path(input_dir).glob('*.png'):
+        match = FILENAME_PATTERN.search(path.name)
+        if not match:
+            continue
+        user_id, ts = match.group(1), int(match.group(2))
+        if user_id not in latest or ts > latest[user_id][0]:
+            latest[user_id] = (ts, path)
+    return [(user_id, path) for user_id, (_, path) in sorted(latest.items())]
+
+
+def get_supabase():
+    if not SUPABASE_AVAILABLE:
+        print("❌ supabase 패키지가 설치되지 않았습니다!")
+        print("   설치하려면: pip install supabase")
+        exit(1)
+    supabase_url = os.getenv('SUPABASE_URL')
+    supabase_key = os.getenv('SUPABASE_KEY')
+    if not supabase_url or not supabase_key:
+        print("❌ SUPABASE_URL과 SUPABASE_KEY 환경 변수가 필요합니다!")
+        exit(1)
+    return create_client(supabase_url, supabase_key)
+
+
+def collect_supabase_sources(supabase: "Client", only_missing):
+    """path_drawing_url이 있는 사용자를 PAGE_SIZE씩 나눠 모두 가져옵니다. (PostgREST max-rows 제한)"""
+    sources = []
+    offset = 0
+    while True:
+        query = supabase.table('user').select('user_id, path_drawing_url').not_.is_('path_drawing_url', 'null')
+        if only_missing:
+            query = query.is_('path_polyline', 'null')
+        rows = query.order('user_id').range(offset, offset + PAGE_SIZE - 1).execute().data or []
+        sources.extend((row['user_id'], row['path_drawing_url']) for row in rows)
+        if len(rows) < PAGE_SIZE:
+            return sources
+        offset += PAGE_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description='이동 경로 이미지 벡터화 및 지나간 부스 추출')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--input-dir', help='경로 이미지(PNG)가 있는 로컬 디렉토리')
+    source.add_argument('--from-supabase', action='store_true', help='user.path_drawing_url에서 내려받기')
+    parser.add_argument('--all', action='store_true', help='이미 벡터화된 사용자도 다시 처리 (--from-supabase)')
+    parser.add_argument('--upload', action='store_true', help='결과를 user.path_polyline / path_booths에 저장')
+    parser.add_argument('--output', default='path_polylines.jsonl')
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 풀 크기 (기본: CPU 수)')
+    args = parser.parse_args()
+
+    booth_ids, booth_xy = load_booth_positions()
+    supabase = get_supabase() if (args.from_supabase or args.upload) else None
+
+    if args.input_dir:
+        sources = collect_local_sources(args.input_dir)
+    else:
+        sources = collect_supabase_sources(supabase, only_missing=not args.all)
+
+    print(f"🖼️  처리할 경로 이미지: {len(sources)}개")
+    if not sources:
+        return
+
+    results = []
+    total_image = total_encoded = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(_worker, (user_id, src, booth_ids, booth_xy)): user_id
+            for user_id, src in sources
+        }
+        for future in as_completed(futures):
+            user_id = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"  ❌ {user_id}: {e}")
+                continue
+            results.append(result)
+            total_image += result['image_bytes']
+            total_encoded += result['encoded_bytes']
+            print(f"  ✅ {user_id}: 획 {len(result['polylines'])}개, 점 {result['num_points']}개, "
+                  f"부스 {len(result['booths_passed'])}개, {result['image_bytes']:,}B → {result['encoded_bytes']:,}B")
+
+    results.sort(key=lambda r: str(r['user_id']))
+    with open(args.output, 'w', encoding='utf-8') as f:
+        for result in results:
+            json.dump(result, f, ensure_ascii=False)
+            f.write('\n')
+
+    if args.upload:
+        for result in results:
+            supabase.table('user').update({
+                'path_polyline': result['polylines'],
+                'path_booths': result['booths_passed'],
+            }).eq('user_id', result['user_id']).execute()
+        print(f"📤 {len(results)}명의 경로를 user 테이블에 저장했습니다.")
+
+    print("\n" + "=" * 60)
+    print("✅ 벡터화 완료!")
+    print("=" * 60)
+    print(f"  처리: {len(results)}/{len(sources)}명")
+    print(f"  용량: {total_image:,}B → {total_encoded:,}B")
+    print(f"\n💾 {args.output}에 저장했습니다.")
+
+
+if __name__ == "__main__":
+    main()
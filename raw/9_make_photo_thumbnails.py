@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+user-photos 버킷의 사진으로 썸네일(WebP/AVIF)을 만드는 워커
+
+supabaseService.uploadPhoto / uploadPathImages는 폰 원본 사진과 합성 이미지를 그대로 올리기 때문에
+화면에서 원본(수 MB)을 내려받게 됩니다. 이 스크립트는
+- EXIF 회전을 적용한 뒤 EXIF/메타데이터를 모두 제거하고
+- 여러 크기(SIZES)의 WebP, AVIF(지원 시) 썸네일을 프로세스 풀에서 생성하고
+- 원본 내용의 해시를 키로 저장하여(thumbnails/{hash}/{size}.{format}) 같은 사진은 다시 만들지 않으며
+- 파생 이미지 URL을 user.photo_thumbnails / evaluation.photo_thumbnails에 기록합니다.
+  (add-photo-thumbnails-column.sql)
+
+사용법:
+    # 로컬 디렉토리 (예: loadtest/fake_services.py --storage-dir 로 받은 업로드)
+    python3 9_make_photo_thumbnails.py --input-dir ./storage/user-photos --output-dir ./thumbnails
+
+    # Supabase: 썸네일이 없는 user / evaluation 사진만 처리
+    python3 9_make_photo_thumbnails.py --from-supabase
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    print("❌ Pillow 패키지가 설치되지 않았습니다!")
+    print("   설치하려면: pip install pillow")
+    exit(1)
+
+# Supabase는 선택적으로 import (없어도 로컬 디렉토리 모드는 동작)
+try:
+    from supabase import create_client, Client
+    SUPABASE_AVAILABLE = True
+except ImportError:
+    SUPABASE_AVAILABLE = False
+
+BUCKET = 'user-photos'
+THUMBNAIL_PREFIX = 'thumbnails'
+
+# 긴 변 기준 최대 크기 (px)
+SIZES = {
+    'sm': 320,    # 목록/갤러리
+    'md': 960,    # 상세 화면
+}
+
+# 포맷별 저장 옵션 (AVIF는 Pillow 빌드에서 지원할 때만 생성)
+FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 6},
+    'avif': {'format': 'AVIF', 'quality': 60},
+}
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.heic', '.heif', '.avif'}
+
+# PostgREST는 한 번에 max-rows(기본 1000)행까지만 돌려주므로 이 크기로 나눠서 조회
+PAGE_SIZE = 1000
+
+
+def available_formats():
+    return [fmt for fmt in FORMATS if features.check(fmt)]
+
+
+def content_hash(image_bytes):
+    return hashlib.sha256(image_bytes).hexdigest()[:32]
+
+
+def derivative_keys(digest, formats):
+    """해시 하나에 대한 파생 이미지 이름 → 저장 경로"""
+    return {
+        f"{size}_{fmt}": f"{THUMBNAIL_PREFIX}/{digest}/{size}.{fmt}"
+        for size in SIZES for fmt in formats
+    }
+
+
+def make_thumbnails(image_bytes, formats):
+    """
+    원본 바이트에서 썸네일들을 만듭니다. (프로세스 풀 워커에서 실행)
+
+    Returns:
+        {'sm_webp': bytes, 'md_webp': bytes, ...}
+    """
+    image = Image.open(io.BytesIO(image_bytes))
+    # 폰 사진은 EXIF Orientation으로 회전 정보를 가지므로 픽셀에 먼저 적용
+    image = ImageOps.exif_transpose(image)
+    # 합성 경로 이미지처럼 투명도가 있는 경우만 알파 유지
+    has_alpha = image.mode in ('RGBA', 'LA') or 'transparency' in image.info
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    outputs = {}
+    for size_name, max_edge in SIZES.items():
+        resized = image.copy()
+        resized.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        for fmt in formats:
+            buffer = io.BytesIO()
+            # exif/icc 인자를 넘기지 않으므로 메타데이터는 모두 제거됨
+            resized.save(buffer, **FORMATS[fmt])
+            outputs[f"{size_name}_{fmt}"] = buffer.getvalue()
+    return outputs
+
+
+# 로컬 디렉토리 모드 ----------------------------------------------------------------
+
+def _local_worker(task):
+    source_path, output_dir, formats = task
+    image_bytes = Path(source_path).read_bytes()
+    digest = content_hash(image_bytes)
+    keys = derivative_keys(digest, formats)
+    targets = {name: Path(output_dir) / key for name, key in keys.items()}
+
+    # 같은 내용의 사진은 이미 만들어 둔 썸네일을 그대로 사용
+    if all(t.exists() for t in targets.values()):
+        return source_path, digest, {n: str(t) for n, t in targets.items()}, len(image_bytes), 0, True
+
+    outputs = make_thumbnails(image_bytes, formats)
+    written = 0
+    for name, data in outputs.items():
+        targets[name].parent.mkdir(parents=True, exist_ok=True)
+        targets[name].write_bytes(data)
+        written += len(data)
+    return source_path, digest, {n: str(t) for n, t in targets.items()}, len(image_bytes), written, False
+
+
+def run_local(args, formats):
+    input_dir = Path(args.input_dir)
+    output_dir = Path(args.output_dir)
+    manifest_path = output_dir / 'manifest.json'
+
+    manifest = {}
+    if manifest_path.exists():
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    sources = [
+        p for p in sorted(input_dir.rglob('*'))
+        if p.suffix.lower() in IMAGE_EXTENSIONS and output_dir.resolve() not in p.resolve().parents
+    ]
+    print(f"🖼️  사진 {len(sources)}개 발견")
+
+    generated = skipped = 0
+    total_original = total_thumbs = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(_local_worker, (str(p), str(output_dir), formats)) for p in sources]
+        for future in as_completed(futures):
+            try:
+                source_path, digest, derivatives, original_size, written, reused = future.result()
+            except Exception as e:
+                print(f"  ❌ 처리 실패: {e}")
+                continue
+            rel = str(Path(source_path).relative_to(input_dir))
+            manifest[rel] = {'hash': digest, 'thumbnails': derivatives}
+            if reused:
+                skipped += 1
+            else:
+                generated += 1
+                total_original += original_size
+                total_thumbs += written
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    print("\n" + "=" * 60)
+    print("✅ 썸네일 생성 완료!")
+    print("=" * 60)
+    print(f"  새로 생성: {generated}개, 재사용: {skipped}개")
+    if generated:
+        print(f"  용량: 원본 {total_original:,}B → 썸네일 전체 {total_thumbs:,}B")
+    print(f"\n💾 {manifest_path}에 저장했습니다.")
+
+
+# Supabase 모드 -------------------------------------------------------------------
+
+def _thumbnail_exists(url):
+    request = urllib.request.Request(url, method='HEAD')
+    try:
+        with urllib.request.urlopen(request, timeout=30) as resp:
+            return resp.status == 200
+    except urllib.error.HTTPError:
+        return False
+
+
+def _remote_worker(task):
+    url, formats, public_base = task
+    with urllib.request.urlopen(url, timeout=60) as resp:
+        image_bytes = resp.read()
+    digest = content_hash(image_bytes)
+
+    # 같은 내용의 사진은 이미 올라간 썸네일을 그대로 사용 (인코딩/업로드 생략)
+    keys = derivative_keys(digest, formats)
+    if all(_thumbnail_exists(f"{public_base}/{key}") for key in keys.values()):
+        return url, digest, None
+    return url, digest, make_thumbnails(image_bytes, formats)
+
+
+def get_supabase():
+    if not SUPABASE_AVAILABLE:
+        print("❌ supabase 패키지가 설치되지 않았습니다!")
+        print("   설치하려면: pip install supabase")
+        exit(1)
+    supabase_url = os.getenv('SUPABASE_URL')
+    supabase_key = os.getenv('SUPABASE_KEY')
+    if not supabase_url or not supabase_key:
+        print("❌ SUPABASE_URL과 SUPABASE_KEY 환경 변수가 필요합니다!")
+        exit(1)
+    return create_client(supabase_url, supabase_key)
+
+
+def fetch_photo_rows(supabase, table, key_cols, only_missing):
+    """photo_url이 있는 행을 PAGE_SIZE씩 나눠 모두 가져옵니다."""
+    rows = []
+    offset = 0
+    while True:
+        query = (
+            supabase.table(table)
+            .select(', '.join(key_cols + ['photo_url']))
+            .not_.is_('photo_url', 'null')
+        )
+        if only_missing:
+            query = query.is_('photo_thumbnails', 'null')
+        for col in key_cols:
+            query = query.order(col)
+        page = query.range(offset, offset + PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        offset += PAGE_SIZE
+
+
+def run_supabase(args, formats):
+    supabase: Client = get_supabase()
+    storage = supabase.storage.from_(BUCKET)
+
+    # 썸네일이 아직 없는 사진만 (photo_url 기준으로 묶어서 같은 사진은 한 번만 처리)
+    pending = {}
+    for table, key_cols in (('user', ['user_id']), ('evaluation', ['user_id', 'booth_id'])):
+        for row in fetch_photo_rows(supabase, table, key_cols, only_missing=not args.all):
+            pending.setdefault(row['photo_url'], []).append((table, {c: row[c] for c in key_cols}))
+
+    print(f"🖼️  처리할 사진: {len(pending)}개")
+    if not pending:
+        return
+
+    # 워커가 썸네일 존재 여부를 확인할 공개 URL 기준 경로 (.../object/public/user-photos)
+    public_base = storage.get_public_url(THUMBNAIL_PREFIX).rstrip('?').rsplit('/', 1)[0]
+
+    done = reused = 0
+    uploaded = set()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(_remote_worker, (url, formats, public_base)) for url in pending]
+        for future in as_completed(futures):
+            try:
+                url, digest, outputs = future.result()
+            except Exception as e:
+                print(f"  ❌ 처리 실패: {e}")
+                continue
+
+            keys = derivative_keys(digest, formats)
+            if outputs is None or digest in uploaded:
+                reused += 1
+            else:
+                # 해시 기반 경로이므로 upsert로 다시 올려도 같은 내용 (재실행 시에도 안전)
+                for name, data in outputs.items():
+                    fmt = name.split('_', 1)[1]
+                    storage.upload(keys[name], data, {
+                        'content-type': f'image/{fmt}',
+                        'cache-control': '31536000',
+                        'upsert': 'true',
+                    })
+                uploaded.add(digest)
+            thumbnails = {name: storage.get_public_url(key) for name, key in keys.items()}
+
+            for table, match in pending[url]:
+                query = supabase.table(table).update({'photo_thumbnails': thumbnails})
+                for col, val in match.items():
+                    query = query.eq(col, val)
+                query.execute()
+
+            done += 1
+            print(f"  ✅ {done}/{len(pending)} {digest[:12]} ({len(pending[url])}개 행 업데이트)")
+
+    print(f"\n✅ 썸네일 생성 완료: {done}/{len(pending)}개 (기존 썸네일 재사용 {reused}개)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='user-photos 썸네일 생성')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--input-dir', help='원본 사진이 있는 로컬 디렉토리')
+    source.add_argument('--from-supabase', action='store_true', help='user / evaluation의 photo_url에서 내려받기')
+    parser.add_argument('--output-dir', default='thumbnails', help='로컬 모드 썸네일 저장 디렉토리')
+    parser.add_argument('--all', action='store_true', help='이미 썸네일이 있는 행도 다시 처리 (--from-supabase)')
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 풀 크기 (기본: CPU 수)')
+    args = parser.parse_args()
+
+    formats = available_formats()
+    if 'avif' not in formats:
+        print("⚠️  이 Pillow 빌드는 AVIF를 지원하지 않습니다. WebP만 생성합니다.")
+
+    if args.input_dir:
+        run_local(args, formats)
+    else:
+        run_supabase(args, formats)
+
+
+if __name__ == "__main__":
+    main()
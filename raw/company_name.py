@@ -0,0 +1,32 @@
+import re
+
+
+def preprocess_company_name(name):
+    """
+    업체명 비교용 정규화
+
+    1. 줄바꿈 제거
+    2. 양쪽의 '(주)', '㈜', '주식회사' 반복 제거
+    3. 모든 공백 제거
+    """
+    # Handle NaN / None values (pandas NaN은 자기 자신과 같지 않음)
+    if name is None or name != name:
+        return ''
+    name = str(name)
+    
+    # 1. Remove newlines and carriage returns
+    name = name.replace('\n', '').replace('\r', '')
+    
+    # 2. Remove '(주)', '㈜', '주식회사' from both sides iteratively
+    patterns = [r'^\(주\)', r'^㈜', r'^주식회사', r'\(주\)$', r'㈜$', r'주식회사$']
+    prev_name = None
+    while prev_name != name:
+        prev_name = name
+        for pat in patterns:
+            name = re.sub(pat, '', name)
+        name = name.strip()  # Remove spaces after each iteration
+    
+    # 3. Remove all spaces
+    name = name.replace(' ', '')
+    
+    return name
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+주최측 엑셀(xlsx)을 스트리밍으로 읽는 공용 모듈
+
+pd.read_excel은 워크북 전체 셀을 파이썬 객체로 올린 뒤에야 필터링을 하기 때문에
+이미지/시트가 많은 주최측 원본에서는 느리고 메모리를 많이 씁니다.
+여기서는 openpyxl read_only 모드로 행을 하나씩 읽으면서 필요한 컬럼만 골라
+일정 크기의 청크(dict 리스트)로 넘겨줍니다. 메모리 사용량은 청크 크기에만 비례합니다.
+"""
+
+import csv
+import itertools
+import re
+from pathlib import Path
+
+try:
+    from openpyxl import load_workbook
+    from openpyxl.utils.escape import unescape
+except ImportError:
+    print("❌ openpyxl 패키지가 설치되지 않았습니다!")
+    print("   설치하려면: pip install openpyxl")
+    raise
+
+# pyarrow는 선택적으로 import (없으면 CSV로만 저장)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+DEFAULT_CHUNK_SIZE = 500
+
+# 헤더를 찾기 위해 시트 앞쪽에서 살펴볼 최대 행 수 (제목/빈 줄이 앞에 붙는 경우 대비)
+HEADER_SCAN_ROWS = 30
+
+# 주최측 마스터파일의 섹션 제목 행 (예: '1. 일반식품 (A,B홀)', '5. 바터부스')
+# → 번호와 괄호 속 홀 정보를 뺀 '일반식품', '바터부스'를 섹션명으로 사용
+SECTION_TITLE_PATTERN = re.compile(r'^\d+\.\s*(.+?)\s*(?:\([^)]*\))?$')
+
+# 주최측 파일마다 헤더 표기가 조금씩 다르므로 별칭을 하나의 컬럼명으로 모읍니다.
+# (매칭할 때는 공백/줄바꿈/';'를 무시합니다. 예: '2. 제품설명;(간략)')
+HEADER_ALIASES = {
+    '부스번호': '부스번호',
+    '부스 번호': '부스번호',
+    '업체명': '업체명',
+    '업체명(국문)': 'company_name_kor',
+    '업체명(영문)': 'company_name_eng',
+    '홈페이지 주소': 'homepage',
+    '회사소개(국문)': 'company_description',
+    '회사소개(영문)': 'company_description_eng',
+    '1. 제품명': 'products',
+    '2. 제품설명(간략)': 'products_description',
+    '연번': 'index',
+    'NO': 'index',
+    '특별관 분류': '특별관',
+    '카테고리': '카테고리',
+}
+
+# 두 줄 헤더에서 (윗줄 그룹명, 아랫줄 이름) 조합으로만 의미가 정해지는 컬럼
+GROUPED_HEADER_ALIASES = {
+    ('상호간판', '국문'): 'signboard_kor',
+    ('상호간판', '영문'): 'signboard_eng',
+}
+
+
+class HeaderNotFoundError(ValueError):
+    """시트 앞쪽에서 필요한 컬럼이 모두 있는 헤더 행을 찾지 못한 경우"""
+
+
+def _alias_key(text):
+    return re.sub(r'[\s;]+', '', text)
+
+
+_ALIAS_LOOKUP = {_alias_key(k): v for k, v in HEADER_ALIASES.items()}
+
+
+def normalize_header(value):
+    """헤더 셀 값에서 줄바꿈/중복 공백을 정리하고 별칭을 통일합니다."""
+    if value is None:
+        return None
+    text = re.sub(r'\s+', ' ', str(value).replace('\n', '').replace('\r', '')).strip()
+    if not text:
+        return None
+    return _ALIAS_LOOKUP.get(_alias_key(text), text)
+
+
+def detect_header(rows, required_columns, max_scan=HEADER_SCAN_ROWS):
+    """
+    앞쪽 행들 중에서 required_columns를 모두 포함하는 첫 행을 헤더로 찾습니다.
+
+    Returns:
+        (헤더 행 번호(0부터), 정규화된 헤더 리스트)
+    """
+    required = set(required_columns)
+    for row_idx, row in enumerate(rows):
+        if row_idx >= max_scan:
+            break
+        header = [normalize_header(v) for v in row]
+        if required.issubset(h for h in header if h):
+            return row_idx, header
+    raise HeaderNotFoundError(f"헤더를 찾을 수 없습니다. 필요한 컬럼: {sorted(required)}")
+
+
+def is_subheader_row(row, header, required_columns):
+    """
+    헤더 바로 다음 행이 두 줄 헤더의 아랫줄인지 확인합니다.
+
+    주최측 원본은 윗줄에 그룹명(국내식품, 해외식품 ...)을 병합 셀로 두고
+    아랫줄에 실제 카테고리명을 둡니다. 아랫줄은 필수 컬럼 자리가 비어 있고
+    나머지 셀이 모두 문자열입니다.
+    """
+    if row is None:
+        return False
+    key_indices = [idx for idx, name in enumerate(header) if name in required_columns]
+    if any(idx < len(row) and row[idx] not in (None, '') for idx in key_indices):
+        return False
+    values = [v for v in row if v not in (None, '')]
+    return len(values) >= 2 and all(isinstance(v, str) for v in values)
+
+
+def merge_header_rows(top, sub_row):
+    """
+    두 줄 헤더를 컬럼명 하나씩으로 합칩니다.
+
+    병합 셀은 첫 칸에만 값이 있으므로 윗줄 그룹명을 오른쪽으로 이어 붙이고,
+    아랫줄 이름이 있는 컬럼은 아랫줄 이름을 컬럼명으로 씁니다.
+    """
+    merged = []
+    group = None
+    for idx, name in enumerate(top):
+        if name:
+            group = name
+        sub = normalize_header(sub_row[idx]) if idx < len(sub_row) else None
+        if sub is None:
+            merged.append(name)
+        else:
+            merged.append(GROUPED_HEADER_ALIASES.get((group, sub), sub))
+    return merged
+
+
+def section_title(row):
+    """첫 칸에만 '번호. 섹션명'이 있는 행이면 섹션명을, 아니면 None을 반환합니다."""
+    if row is None:
+        return None
+    values = [v for v in row if v not in (None, '')]
+    if len(values) != 1 or row[0] is None or not isinstance(row[0], str):
+        return None
+    match = SECTION_TITLE_PATTERN.match(row[0].strip())
+    return match.group(1) if match else None
+
+
+def clean_value(value):
+    """셀 값을 CSV/JSON으로 내보내기 좋은 타입으로 정리합니다."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        # read_only 모드는 셀 안의 CR을 '_x000D_' 형태로 그대로 돌려줌
+        value = unescape(value).replace('\r\n', '\n').replace('\r', '\n').strip()
+        return value if value else None
+    # 엑셀은 정수도 float로 저장하는 경우가 많음 (예: 연번 1.0)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def iter_xlsx_chunks(xlsx_path, required_columns, columns=None, sheet_name=None,
+                     chunk_size=DEFAULT_CHUNK_SIZE, expected_columns=None, section_column=None):
+    """
+    xlsx 파일을 스트리밍으로 읽어 dict 리스트 청크를 yield 합니다.
+
+    Args:
+        xlsx_path: 엑셀 파일 경로
+        required_columns: 헤더 자동 감지에 쓸 필수 컬럼명 (예: ['부스번호', '업체명'])
+        columns: 남길 컬럼 목록. None이면 이름이 있는 모든 컬럼을 남깁니다.
+        sheet_name: 읽을 시트 이름. None이면 활성 시트
+        chunk_size: 한 번에 넘길 행 수
+        expected_columns: 헤더에 반드시 있어야 하는 컬럼. 없으면 빈 컬럼으로 쓰지 않고 ValueError
+        section_column: 헤더에 이 컬럼이 없으면 가장 최근 섹션 제목 행의 섹션명으로 채웁니다.
+                        (마스터파일은 카테고리를 컬럼 대신 '1. 일반식품 (A,B홀)' 같은 제목 행으로 구분)
+
+    섹션마다 헤더가 반복되고 컬럼 구성이 다를 수 있으므로(예: 바터부스는 특별관 대신 홀),
+    반복 헤더 행을 만나면 그 헤더 기준으로 컬럼 위치를 다시 계산합니다.
+
+    Raises:
+        HeaderNotFoundError: 앞쪽 HEADER_SCAN_ROWS행에서 헤더를 찾지 못한 경우
+    """
+    wb = load_workbook(xlsx_path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.active
+        rows = ws.iter_rows(values_only=True)
+
+        # 헤더 감지: 헤더 행까지만 소비하고 나머지 행은 같은 iterator로 이어서 읽음
+        header = None
+        section = None
+        for row_idx, row in enumerate(rows):
+            if row_idx >= HEADER_SCAN_ROWS:
+                break
+            section = section_title(row) or section
+            try:
+                _, header = detect_header([row], required_columns, max_scan=1)
+                break
+            except HeaderNotFoundError:
+                continue
+        if header is None:
+            raise HeaderNotFoundError(
+                f"{xlsx_path}: 앞쪽 {HEADER_SCAN_ROWS}행에서 헤더를 찾을 수 없습니다. "
+                f"필요한 컬럼: {sorted(required_columns)}"
+            )
+
+        # 두 줄 헤더면 아랫줄까지 합치고, 아니면 읽은 행을 데이터로 되돌림
+        pending = []
+        top_header = header
+        next_row = next(rows, None)
+        if is_subheader_row(next_row, header, required_columns):
+            header = merge_header_rows(header, next_row)
+        elif next_row is not None:
+            pending.append(next_row)
+
+        missing = [c for c in (expected_columns or []) if c not in header]
+        if missing:
+            raise ValueError(f"{xlsx_path}: 헤더에 필요한 컬럼이 없습니다: {missing}")
+
+        # 필요한 컬럼의 위치만 미리 계산 (projection)
+        wanted = set(columns) if columns is not None else None
+
+        def project(header):
+            projection = [
+                (idx, name) for idx, name in enumerate(header)
+                if name and (wanted is None or name in wanted)
+            ]
+            key_names = [name for _, name in projection if name in required_columns]
+            fill_section = section_column is not None and section_column not in header
+            return projection, key_names, fill_section
+
+        projection, key_names, fill_section = project(header)
+
+        chunk = []
+        for row in itertools.chain(pending, rows):
+            if row is None:
+                continue
+
+            # 섹션 제목 행: 이후 행의 섹션명으로 기억하고 건너뜀
+            title = section_title(row)
+            if title:
+                section = title
+                continue
+
+            # 섹션마다 반복되는 헤더 행: 컬럼 구성이 다를 수 있으므로 다시 projection
+            repeated = [normalize_header(v) for v in row]
+            if set(required_columns).issubset(h for h in repeated if h):
+                if repeated not in (header, top_header):
+                    header = repeated
+                    projection, key_names, fill_section = project(header)
+                continue
+
+            record = {}
+            for idx, name in projection:
+                record[name] = clean_value(row[idx]) if idx < len(row) else None
+
+            # 빈 행은 건너뜀
+            if all(record.get(name) is None for name in key_names):
+                continue
+            if fill_section:
+                record[section_column] = section
+
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+    finally:
+        wb.close()
+
+
+def iter_directory_chunks(directory, required_columns, pattern='*.xlsx', **kwargs):
+    """
+    디렉토리 안의 모든 xlsx 파일을 순서대로 스트리밍합니다. (파일 하나씩만 열림)
+
+    형식이 다른 주최측 파일(헤더를 찾을 수 없는 파일)은 경고만 출력하고 건너뜁니다.
+    """
+    for xlsx_path in sorted(Path(directory).glob(pattern)):
+        # 엑셀이 열려 있을 때 생기는 잠금 파일(~$...)은 건너뜀
+        if xlsx_path.name.startswith('~$'):
+            continue
+        print(f"📄 읽는 중: {xlsx_path.name}")
+        try:
+            yield from iter_xlsx_chunks(xlsx_path, required_columns, **kwargs)
+        except HeaderNotFoundError as e:
+            print(f"  ⚠️  건너뜀: {e}")
+
+
+def is_checked(value):
+    """one-hot 카테고리 셀이 체크된 값인지 확인합니다. ('O', 1, True)"""
+    if isinstance(value, str):
+        return value.strip().upper() == 'O'
+    if value is True:
+        return True
+    return isinstance(value, (int, float)) and value == 1
+
+
+def collapse_categories(record, category_cols):
+    """one-hot 인코딩된 category 컬럼들을 'a,b,c' 형태의 문자열 하나로 합칩니다."""
+    categories = [col for col in category_cols if is_checked(record.pop(col, None))]
+    record['category'] = ','.join(categories)
+    return record
+
+
+class ChunkWriter:
+    """
+    청크 단위로 CSV(+ 선택적으로 Parquet)에 이어 쓰는 writer
+
+    with ChunkWriter('foodweek.csv', columns) as writer:
+        for chunk in iter_xlsx_chunks(...):
+            writer.write(chunk)
+    """
+
+    def __init__(self, csv_path, columns, parquet_path=None):
+        self.csv_path = csv_path
+        self.columns = list(columns)
+        self.parquet_path = parquet_path
+        self.rows_written = 0
+        self._csv_file = None
+        self._csv_writer = None
+        self._parquet_writer = None
+        self._schema = None
+
+        if parquet_path and not PYARROW_AVAILABLE:
+            print("⚠️  pyarrow 패키지가 설치되지 않았습니다. CSV로만 저장됩니다.")
+            self.parquet_path = None
+
+    def __enter__(self):
+        # 기존 스크립트와 동일하게 엑셀에서 바로 열리도록 utf-8-sig로 저장
+        self._csv_file = open(self.csv_path, 'w', newline='', encoding='utf-8-sig')
+        self._csv_writer = csv.DictWriter(self._csv_file, fieldnames=self.columns, extrasaction='ignore')
+        self._csv_writer.writeheader()
+        if self.parquet_path:
+            # 엑셀 셀 타입이 파일마다 섞여 있으므로 모든 컬럼을 문자열로 고정
+            self._schema = pa.schema([(col, pa.string()) for col in self.columns])
+            self._parquet_writer = pq.ParquetWriter(self.parquet_path, self._schema)
+        return self
+
+    def write(self, chunk):
+        self._csv_writer.writerows(chunk)
+        if self._parquet_writer:
+            arrays = [
+                pa.array([None if r.get(col) is None else str(r.get(col)) for r in chunk], pa.string())
+                for col in self.columns
+            ]
+            self._parquet_writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+        self.rows_written += len(chunk)
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._csv_file:
+            self._csv_file.close()
+        if self._parquet_writer:
+            self._parquet_writer.close()
+        return False
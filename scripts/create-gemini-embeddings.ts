@@ -1,4 +1,5 @@
 import { createClient } from '@supabase/supabase-js';
+import crypto from 'crypto';
 import fs from 'fs';
 import path from 'path';
 
@@ -19,6 +20,13 @@ interface BoothData {
   products_description: string;
 }
 
+interface DedupText {
+  id: string;
+  canonical_id: string;
+  text: string;
+  source_hash: string;
+}
+
 interface SimilarityResult {
   booth1: string;
   booth2: string;
@@ -46,6 +54,26 @@ async function loadBoothData(): Promise<BoothData[]> {
   }
 }
 
+// 중복 제거된 임베딩 입력 텍스트 로드 (raw/7_dedup_booth_texts.py 결과, 없으면 빈 Map)
+function loadDedupTexts(): Map<string, DedupText> {
+  const dedupPath = path.join(process.cwd(), 'public', 'booth_text_dedup.jsonl');
+  const dedupMap = new Map<string, DedupText>();
+  if (!fs.existsSync(dedupPath)) {
+    return dedupMap;
+  }
+
+  const lines = fs.readFileSync(dedupPath, 'utf-8').split('\n').filter(line => line.trim());
+  for (const line of lines) {
+    try {
+      const row: DedupText = JSON.parse(line);
+      dedupMap.set(row.id, row);
+    } catch (error) {
+      console.error('JSON 파싱 오류:', error, 'Line:', line);
+    }
+  }
+  return dedupMap;
+}
+
 // Gemini Embedding을 통한 텍스트 임베딩 생성
 async function generateGeminiEmbedding(text: string, maxRetries: number = 3): Promise<number[]> {
   for (let attempt = 1; attempt <= maxRetries; attempt++) {
@@ -100,6 +128,47 @@ function cosineSimilarity(vecA: number[], vecB: number[]): number {
   return dotProduct / (magnitudeA * magnitudeB);
 }
 
+// 임베딩 입력 필드의 해시 (raw/7_dedup_booth_texts.py의 source_hash와 같은 방식)
+function sourceHash(booth: BoothData): string {
+  const fields = [
+    booth.company_name_kor,
+    booth.category,
+    booth.company_description,
+    booth.products,
+    booth.products_description
+  ].map(value => (value === null || value === undefined ? '' : String(value)));
+
+  return crypto.createHash('sha256').update(fields.join('\x1f'), 'utf8').digest('hex');
+}
+
+// 현재 부스 데이터와 일치하는 중복 제거 행만 반환 (설명이 바뀐 부스는 undefined)
+function currentDedup(booth: BoothData, dedupTexts: Map<string, DedupText>): DedupText | undefined {
+  const dedupRow = dedupTexts.get(booth.id);
+  return dedupRow && dedupRow.source_hash === sourceHash(booth) ? dedupRow : undefined;
+}
+
+// booth_embeddings에 이미 저장된 임베딩 조회 (pgvector는 PostgREST에서 '[...]' 문자열로 옴)
+async function loadStoredEmbeddings(ids: string[]): Promise<Map<string, number[]>> {
+  const stored = new Map<string, number[]>();
+  const batchSize = 50; // 3072차원 벡터라 응답이 크므로 나눠서 조회
+  for (let i = 0; i < ids.length; i += batchSize) {
+    const { data, error } = await supabase
+      .from('booth_embeddings')
+      .select('id, embedding')
+      .in('id', ids.slice(i, i + batchSize));
+
+    if (error) {
+      console.error('저장된 임베딩 조회 오류:', error);
+      continue;
+    }
+    for (const row of data || []) {
+      const embedding = typeof row.embedding === 'string' ? JSON.parse(row.embedding) : row.embedding;
+      stored.set(row.id, embedding);
+    }
+  }
+  return stored;
+}
+
 // 부스 정보를 하나의 텍스트로 결합
 function combineBoothText(booth: BoothData): string {
   const parts = [
@@ -121,6 +190,13 @@ async function createAndStoreGeminiEmbeddings() {
     // 부스 데이터 로드
     const boothData = await loadBoothData();
     console.log(`📊 총 ${boothData.length}개의 부스 데이터 로드됨`);
+
+    // 중복 제거 텍스트가 있으면 사용하고, 같은 canonical_id를 가진 부스는 임베딩을 공유
+    const dedupTexts = loadDedupTexts();
+    const sharedEmbeddings = new Map<string, number[]>();
+    if (dedupTexts.size > 0) {
+      console.log(`♻️ 중복 제거 텍스트 사용: ${dedupTexts.size}개`);
+    }
     
     // 이미 저장된 부스 ID들 가져오기
     const { data: existingBooths, error: fetchError } = await supabase
@@ -144,6 +220,24 @@ async function createAndStoreGeminiEmbeddings() {
       return;
     }
     
+    // 그룹의 대표 부스가 이미 저장돼 있으면 그 임베딩을 같은 그룹의 누락된 부스들이 재사용
+    // (대표 부스 자신의 설명이 바뀌지 않은 경우만)
+    const boothById = new Map<string, BoothData>(boothData.map(booth => [booth.id, booth]));
+    const storedCanonicalIds = new Set<string>();
+    for (const booth of missingBooths) {
+      const canonicalId = currentDedup(booth, dedupTexts)?.canonical_id;
+      const canonical = canonicalId ? boothById.get(canonicalId) : undefined;
+      if (canonicalId && canonicalId !== booth.id && existingIds.has(canonicalId)
+          && canonical && currentDedup(canonical, dedupTexts)) {
+        storedCanonicalIds.add(canonicalId);
+      }
+    }
+    if (storedCanonicalIds.size > 0) {
+      const stored = await loadStoredEmbeddings(Array.from(storedCanonicalIds));
+      stored.forEach((embedding, id) => sharedEmbeddings.set(id, embedding));
+      console.log(`♻️ 저장된 대표 부스 임베딩 재사용: ${stored.size}개`);
+    }
+    
     // 누락된 부스들만 처리
     for (let i = 0; i < missingBooths.length; i++) {
       const booth = missingBooths[i];
@@ -151,10 +245,18 @@ async function createAndStoreGeminiEmbeddings() {
       
       try {
         // 부스 정보를 텍스트로 결합
-        const combinedText = combineBoothText(booth);
+        // (중복 제거 이후 설명이 바뀐 부스는 오래된 텍스트 대신 현재 데이터로 임베딩)
+        const dedup = currentDedup(booth, dedupTexts);
+        if (dedupTexts.has(booth.id) && !dedup) {
+          console.log(`⚠️ ${booth.id}: 중복 제거 텍스트가 현재 데이터와 달라 원본 텍스트 사용`);
+        }
+        const combinedText = dedup?.text || combineBoothText(booth);
+        const embeddingKey = dedup?.canonical_id || booth.id;
         
-        // Gemini 임베딩 생성
-        const embedding = await generateGeminiEmbedding(combinedText);
+        // Gemini 임베딩 생성 (같은 그룹에서 이미 생성한 임베딩이 있으면 재사용)
+        const cachedEmbedding = sharedEmbeddings.get(embeddingKey);
+        const embedding = cachedEmbedding || await generateGeminiEmbedding(combinedText);
+        sharedEmbeddings.set(embeddingKey, embedding);
         
         // Supabase에 저장
         const { error: insertError } = await supabase
@@ -175,8 +277,10 @@ async function createAndStoreGeminiEmbeddings() {
           console.log(`✅ ${booth.company_name_kor} 저장 완료`);
         }
         
-        // API 호출 제한을 위한 지연 (Rate Limit 방지)
-        await new Promise(resolve => setTimeout(resolve, 1000)); // 1초 대기
+        // API 호출 제한을 위한 지연 (Rate Limit 방지) - 임베딩을 재사용한 경우 생략
+        if (!cachedEmbedding) {
+          await new Promise(resolve => setTimeout(resolve, 1000)); // 1초 대기
+        }
         
       } catch (error) {
         console.error(`❌ ${booth.company_name_kor} 처리 오류:`, error);
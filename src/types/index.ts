@@ -48,6 +48,7 @@ export interface Evaluation {
   user_id: string;
   booth_id: string; // A1234, B5678 등의 문자열 형식
   photo_url?: string;
+  photo_thumbnails?: Record<string, string>; // 'sm_webp' 등 -> 썸네일 URL
   booth_rating?: number;
   rec_rating?: number;
   started_at?: string;